@@ -0,0 +1,41 @@
+# Generated manually for search optimization
+
+from django.db import migrations
+
+
+# User search (accounts views and comprehensive_search) filters profiles
+# with __icontains, which Django renders on PostgreSQL as
+# UPPER("column"::text) LIKE UPPER(%s), so the trigram indexes are built on
+# the same expressions
+SEARCH_COLUMNS = ['first_name', 'last_name', 'bio']
+
+
+def add_trigram_indexes(apps, schema_editor):
+    """Add pg_trgm GIN indexes for profile search on PostgreSQL"""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+    for column in SEARCH_COLUMNS:
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_userprofile_{column}_trgm ON accounts_userprofile "
+            f"USING gin (UPPER({column}::text) gin_trgm_ops);"
+        )
+
+
+def remove_trigram_indexes(apps, schema_editor):
+    """Drop the profile search trigram indexes"""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for column in SEARCH_COLUMNS:
+        schema_editor.execute(f"DROP INDEX IF EXISTS idx_userprofile_{column}_trgm;")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_add_investor_interests'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_trigram_indexes, remove_trigram_indexes),
+    ]
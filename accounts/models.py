@@ -2,6 +2,7 @@ from django.db import models
 from django.contrib.auth.models import User
 from django.db.models.signals import post_save
 from django.dispatch import receiver
+from django.utils.functional import cached_property
 
 
 class UserProfile(models.Model):
@@ -113,9 +114,19 @@ class UserProfile(models.Model):
         full_name = self.get_full_name()
         return f"{full_name} ({self.user.username}) - {self.get_user_role_display()}"
 
-        
+    
+    def save(self, *args, **kwargs):
+        # Names may have changed; recompute full_name on next access
+        self.__dict__.pop('full_name', None)
+        super().save(*args, **kwargs)
+    
     def get_full_name(self):
         """Return full name or username if names not provided"""
+        return self.full_name
+    
+    @cached_property
+    def full_name(self):
+        """Full name, computed once per instance (see get_full_name)"""
         if self.first_name and self.last_name:
             return f"{self.first_name} {self.last_name}"
         elif self.first_name:
@@ -125,6 +136,24 @@ class UserProfile(models.Model):
         else:
             return self.user.username
     
+    @staticmethod
+    def university_id_for(user):
+        """
+        University id of user's profile, looked up once per user object
+        (and so once per request) without loading the full profile
+        """
+        if not user.is_authenticated:
+            return None
+        if not hasattr(user, '_university_id_cache'):
+            # Reuse the profile when this request has already loaded it
+            profile = user._state.fields_cache.get('profile')
+            if profile is not None:
+                return profile.university_id
+            user._university_id_cache = UserProfile.objects.filter(
+                user_id=user.id
+            ).values_list('university_id', flat=True).first()
+        return user._university_id_cache
+    
     def get_short_name(self):
         """Return first name or username"""
         return self.first_name or self.user.username
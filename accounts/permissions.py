@@ -0,0 +1,22 @@
+"""
+Role checks shared by the apps' views
+"""
+from rest_framework import permissions
+
+
+def is_investor(user):
+    """Check if user has investor role; memoized on the user for the request"""
+    cached = getattr(user, '_is_investor_cache', None)
+    if cached is not None:
+        return cached
+    value = hasattr(user, 'profile') and user.profile.user_role == 'investor'
+    user._is_investor_cache = value
+    return value
+
+
+class IsInvestor(permissions.BasePermission):
+    """Allow only users with the investor role"""
+    message = 'Access denied. This feature is only available to investors.'
+    
+    def has_permission(self, request, view):
+        return is_investor(request.user)
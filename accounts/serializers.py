@@ -572,8 +572,8 @@ class PostSummarySerializer(serializers.Serializer):
     image_url = serializers.SerializerMethodField()
     visibility = serializers.CharField(read_only=True)
     is_edited = serializers.BooleanField(read_only=True)
-    likes_count = serializers.SerializerMethodField()
-    comments_count = serializers.SerializerMethodField()
+    likes_count = serializers.IntegerField(read_only=True)
+    comments_count = serializers.IntegerField(read_only=True)
     created_at = serializers.DateTimeField(read_only=True)
     
     def get_image_url(self, obj):
@@ -582,12 +582,6 @@ class PostSummarySerializer(serializers.Serializer):
             if request:
                 return request.build_absolute_uri(obj.image.url)
         return None
-    
-    def get_likes_count(self, obj):
-        return obj.get_likes_count()
-    
-    def get_comments_count(self, obj):
-        return obj.get_comments_count()
 
 
 class EnhancedUserProfileSerializer(UserProfileSerializer):
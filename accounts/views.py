@@ -7,6 +7,7 @@ from django.contrib.auth import get_user_model
 from django.shortcuts import get_object_or_404
 from django.db.models import Q
 from .models import UserProfile, Follow
+from .permissions import is_investor
 from .serializers import (
     UserProfileSerializer, 
     UserProfileCreateUpdateSerializer,
@@ -97,11 +98,6 @@ class PublicProfileView(generics.RetrieveAPIView):
         return UserProfile.objects.filter(is_profile_public=True)
 
 
-def is_investor(user):
-    """Check if user has investor role"""
-    return hasattr(user, 'profile') and user.profile.user_role == 'investor'
-
-
 class InvestorProfileView(generics.RetrieveAPIView):
     """
     Investor-specific profile view for students/professors
@@ -0,0 +1,16 @@
+"""
+Cache helpers shared by the apps.
+"""
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+
+def shared_cache_enabled():
+    """
+    Whether the default cache is shared by all workers. Caches that are
+    invalidated on write are only used then: with a per-process cache the
+    invalidation can't reach the other workers, which keep serving stale
+    (or no longer visible) data.
+    """
+    return not isinstance(caches['default'], (LocMemCache, DummyCache))
@@ -0,0 +1,101 @@
+"""
+Queryset optimization helpers.
+
+optimize_queryset() walks a serializer's fields and applies the
+select_related / prefetch_related calls needed to render it, so list
+endpoints don't fall back to one query per row when fields are added.
+
+Serializers can declare relations used by computed fields (method fields,
+values added in to_representation) with a Meta.optimizations dict mapping
+the output key to a list of relation paths, e.g.:
+
+    class Meta:
+        optimizations = {'full_name': ['profile']}
+"""
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+
+def _resolve_path(model, parts):
+    """
+    Follow relation names from `model`.
+    Returns (relation_parts, is_many, final_model, last_is_forward_fk),
+    stopping at the first part that is not a relation.
+    """
+    relations = []
+    is_many = False
+    last_field = None
+    for part in parts:
+        if model is None:
+            break
+        try:
+            field = model._meta.get_field(part)
+        except FieldDoesNotExist:
+            break
+        if not field.is_relation:
+            break
+        relations.append(part)
+        if field.many_to_many or field.one_to_many:
+            is_many = True
+        last_field = field
+        model = field.related_model
+    last_is_forward_fk = bool(
+        last_field is not None and last_field.concrete and last_field.many_to_one
+    )
+    return relations, is_many, model, last_is_forward_fk
+
+
+def _collect(serializer, model, prefix, in_prefetch, select, prefetch):
+    """Recursively collect relation paths for a serializer instance"""
+    def add(path, is_many):
+        if in_prefetch or is_many:
+            prefetch.add(path)
+        else:
+            select.add(path)
+
+    meta = getattr(serializer, 'Meta', None)
+    for paths in getattr(meta, 'optimizations', {}).values():
+        for path in paths:
+            relations, is_many, _, _ = _resolve_path(model, path.split('__'))
+            if relations:
+                add(prefix + '__'.join(relations), is_many)
+
+    for field in serializer.fields.values():
+        if field.write_only or field.source == '*':
+            continue
+
+        relations, is_many, related_model, last_is_forward_fk = _resolve_path(
+            model, field.source.split('.')
+        )
+        if not relations:
+            continue
+
+        nested = field.child if isinstance(field, serializers.ListSerializer) else field
+        if isinstance(field, serializers.PrimaryKeyRelatedField) and last_is_forward_fk:
+            # Only the local <fk>_id column is needed
+            relations = relations[:-1]
+            if not relations:
+                continue
+
+        path = prefix + '__'.join(relations)
+        add(path, is_many)
+
+        if isinstance(nested, serializers.BaseSerializer):
+            _collect(nested, related_model, path + '__', in_prefetch or is_many, select, prefetch)
+
+
+def get_related_paths(serializer_class, model):
+    """Return (select_related, prefetch_related) path lists for a serializer"""
+    select, prefetch = set(), set()
+    _collect(serializer_class(), model, '', False, select, prefetch)
+    return sorted(select), sorted(prefetch)
+
+
+def optimize_queryset(queryset, serializer_class):
+    """Apply select_related/prefetch_related derived from `serializer_class`"""
+    select, prefetch = get_related_paths(serializer_class, queryset.model)
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    return queryset
@@ -98,6 +98,9 @@ MIDDLEWARE = [
 
     # Add the account middleware:
     "allauth.account.middleware.AccountMiddleware",
+
+    # Write notifications queued during the request in one batch
+    'notifications.middleware.NotificationQueueMiddleware',
 ]
 
 # Django allauth configuration (updated for modern allauth)
@@ -3,11 +3,7 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from accounts.models import UserProfile
-
-
-def is_investor(user):
-    """Check if user has investor role"""
-    return hasattr(user, 'profile') and user.profile.user_role == 'investor'
+from accounts.permissions import is_investor
 
 
 @api_view(['GET', 'PUT'])
@@ -2,17 +2,15 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
-from django.db.models import Q
+from django.db.models import Q, prefetch_related_objects
 from django.contrib.auth.models import User
 from projects.models import Project
+from accounts.permissions import is_investor
 from posts.models import Post
 from projects.serializers import ProjectSerializer
+from projects.views import annotate_team_membership
 from posts.serializers import PostSerializer
-
-
-def is_investor(user):
-    """Check if user has investor role"""
-    return hasattr(user, 'profile') and user.profile.user_role == 'investor'
+from posts.views import comments_prefetch
 
 
 @api_view(['GET'])
@@ -82,7 +80,7 @@ def investor_feed(request):
         project_query &= Q(created_at__lt=cursor)
     
     # Get all matching projects (we'll filter by topics in Python)
-    all_projects = Project.objects.filter(project_query).select_related(
+    all_projects = annotate_team_membership(Project.objects.filter(project_query), request.user).select_related(
         'owner', 'owner__profile', 'university'
     ).prefetch_related('team_members', 'team_members__profile').order_by('-created_at')
     
@@ -157,7 +155,7 @@ def investor_feed(request):
     # Get posts (filter by topics in Python for SQLite compatibility)
     all_posts = Post.objects.filter(post_query).select_related(
         'author', 'author__profile', 'university'
-    ).prefetch_related('tagged_projects', 'likes').order_by('-created_at')
+    ).prefetch_related('tagged_projects').order_by('-created_at')
     
     # Filter posts by topic if needed
     filtered_posts = []
@@ -178,6 +176,9 @@ def investor_feed(request):
     
     posts = filtered_posts
     
+    # Load comment threads for the selected posts only, not every candidate
+    prefetch_related_objects(posts, comments_prefetch())
+    
     # Serialize data
     project_data = ProjectSerializer(projects, many=True, context={'request': request}).data
     post_data = PostSerializer(posts, many=True, context={'request': request}).data
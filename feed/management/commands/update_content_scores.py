@@ -1,6 +1,6 @@
 from django.core.management.base import BaseCommand
 from django.utils import timezone
-from django.db.models import Count, Q
+from django.db.models import Q
 from datetime import timedelta
 import logging
 
@@ -59,9 +59,6 @@ class Command(BaseCommand):
         posts = Post.objects.filter(
             created_at__gte=cutoff_date,
             visibility__in=['public', 'university']
-        ).annotate(
-            likes_count=Count('likes', distinct=True),
-            comments_count=Count('comments', distinct=True)
         ).order_by('-created_at')
         
         for i in range(0, posts.count(), batch_size):
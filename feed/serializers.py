@@ -119,14 +119,10 @@ class UserInteractionSerializer(serializers.ModelSerializer):
         content_id = data.get('content_id')
         
         if content_type == 'post':
-            try:
-                Post.objects.get(id=content_id)
-            except Post.DoesNotExist:
+            if not Post.objects.filter(id=content_id).exists():
                 raise serializers.ValidationError("Post not found")
         elif content_type == 'project':
-            try:
-                Project.objects.get(id=content_id)
-            except Project.DoesNotExist:
+            if not Project.objects.filter(id=content_id).exists():
                 raise serializers.ValidationError("Project not found")
         
         return data
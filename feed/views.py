@@ -2,7 +2,7 @@ from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.pagination import PageNumberPagination
-from django.db.models import Q, Count, F, Case, When, IntegerField, FloatField
+from django.db.models import Q, F, Case, When, IntegerField, FloatField
 from django.db import connection
 from django.utils import timezone
 from datetime import timedelta
@@ -223,10 +223,7 @@ class TimelineFeedViewSet(viewsets.ViewSet):
             followed_posts = Post.objects.filter(
                 author_id__in=followed_user_ids,
                 created_at__gte=recent_cutoff
-            ).exclude(author=user).select_related('author', 'university').annotate(
-                likes_count=Count('likes', distinct=True),
-                comments_count=Count('comments', distinct=True)
-            )[:40]  # Get posts from followed users
+            ).exclude(author=user).select_related('author', 'university')[:40]  # Get posts from followed users
             
             for post in followed_posts:
                 # Boost score for followed users
@@ -244,10 +241,7 @@ class TimelineFeedViewSet(viewsets.ViewSet):
                 Q(visibility='university', university=user_university) |
                 Q(visibility='public', university=user_university),
                 created_at__gte=recent_cutoff
-            ).exclude(author=user).exclude(author_id__in=followed_user_ids).select_related('author', 'university').annotate(
-                likes_count=Count('likes', distinct=True),
-                comments_count=Count('comments', distinct=True)
-            )[:60]  # Limit source content
+            ).exclude(author=user).exclude(author_id__in=followed_user_ids).select_related('author', 'university')[:60]  # Limit source content
             
             for post in university_posts:
                 score = self._calculate_content_score(post, user, config, True)
@@ -264,9 +258,6 @@ class TimelineFeedViewSet(viewsets.ViewSet):
                 created_at__gte=recent_cutoff
             ).exclude(university=user_university).exclude(author=user).exclude(author_id__in=followed_user_ids).select_related(
                 'author', 'university'
-            ).annotate(
-                likes_count=Count('likes', distinct=True),
-                comments_count=Count('comments', distinct=True)
             )[:50]  # Limit source content
             
             for post in public_posts:
@@ -318,10 +309,7 @@ class TimelineFeedViewSet(viewsets.ViewSet):
             Q(visibility='university', university=user_university) |
             Q(visibility='public', university=user_university),
             created_at__gte=recent_cutoff
-        ).exclude(author=user).select_related('author', 'university').annotate(
-            likes_count=Count('likes', distinct=True),
-            comments_count=Count('comments', distinct=True)
-        )[:40]
+        ).exclude(author=user).select_related('author', 'university')[:40]
         
         for post in university_posts:
             score = self._calculate_content_score(post, user, config, True)
@@ -359,10 +347,7 @@ class TimelineFeedViewSet(viewsets.ViewSet):
         public_posts = Post.objects.filter(
             visibility='public',
             created_at__gte=recent_cutoff
-        ).exclude(author=user).select_related('author', 'university').annotate(
-            likes_count=Count('likes', distinct=True),
-            comments_count=Count('comments', distinct=True)
-        )[:50]
+        ).exclude(author=user).select_related('author', 'university')[:50]
         
         for post in public_posts:
             score = self._calculate_content_score(post, user, config, False)
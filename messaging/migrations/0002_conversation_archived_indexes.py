@@ -0,0 +1,24 @@
+# Generated by Django 5.2.6 on 2026-10-15 22:34
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messaging', '0001_initial'),
+        ('projects', '0005_add_search_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='conversation',
+            index=models.Index(fields=['participant_1', 'archived_by_p1', '-last_message_at'], name='messaging_c_partici_bc4b59_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='conversation',
+            index=models.Index(fields=['participant_2', 'archived_by_p2', '-last_message_at'], name='messaging_c_partici_300c5a_idx'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.6 on 2026-10-15 22:36
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_unread_counters(apps, schema_editor):
+    """Populate unread counters from existing unread messages"""
+    Conversation = apps.get_model('messaging', 'Conversation')
+    Message = apps.get_model('messaging', 'Message')
+
+    def unread_sent_by(participant_field):
+        return Coalesce(Subquery(
+            Message.objects.filter(
+                conversation=OuterRef('pk'),
+                read=False,
+                sender=OuterRef(participant_field)
+            ).values('conversation').annotate(total=Count('id')).values('total')[:1]
+        ), 0)
+
+    Conversation.objects.update(
+        unread_for_p1=unread_sent_by('participant_2'),
+        unread_for_p2=unread_sent_by('participant_1'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messaging', '0002_conversation_archived_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='conversation',
+            name='unread_for_p1',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='conversation',
+            name='unread_for_p2',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_unread_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.6 on 2026-10-15 22:38
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messaging', '0003_conversation_unread_counters'),
+        ('projects', '0005_add_search_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='projectviewrequest',
+            index=models.Index(fields=['recipient', 'status', '-created_at'], name='messaging_p_recipie_b93da9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='projectviewrequest',
+            index=models.Index(fields=['requester', '-created_at'], name='messaging_p_request_a5e965_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='projectviewrequest',
+            index=models.Index(condition=models.Q(('status', 'pending')), fields=['recipient', '-created_at'], name='msg_pvr_pending_recipient_idx'),
+        ),
+    ]
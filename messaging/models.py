@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import F
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
 import uuid
@@ -52,6 +53,10 @@ class Conversation(models.Model):
     archived_by_p1 = models.BooleanField(default=False)
     archived_by_p2 = models.BooleanField(default=False)
     
+    # Denormalized unread message counters for each participant
+    unread_for_p1 = models.PositiveIntegerField(default=0)
+    unread_for_p2 = models.PositiveIntegerField(default=0)
+    
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -63,6 +68,10 @@ class Conversation(models.Model):
         ordering = ['-last_message_at', '-created_at']
         # Ensure no duplicate conversations
         unique_together = [['participant_1', 'participant_2']]
+        indexes = [
+            models.Index(fields=['participant_1', 'archived_by_p1', '-last_message_at']),
+            models.Index(fields=['participant_2', 'archived_by_p2', '-last_message_at']),
+        ]
     
     def __str__(self):
         return f"Conversation: {self.participant_1.username} & {self.participant_2.username}"
@@ -86,17 +95,40 @@ class Conversation(models.Model):
             return self.participant_2
         return self.participant_1
     
+    @staticmethod
+    def archived_filter(user, archived):
+        """
+        Q for the user's conversations with the given archived state.
+        Each branch matches one (participant, archived_by, last_message_at)
+        index, so the database can combine two index scans.
+        """
+        return (
+            models.Q(participant_1=user, archived_by_p1=archived) |
+            models.Q(participant_2=user, archived_by_p2=archived)
+        )
+    
     def is_participant(self, user):
         """Check if user is a participant in this conversation"""
-        return user == self.participant_1 or user == self.participant_2
+        return user.id in (self.participant_1_id, self.participant_2_id)
+    
+    def unread_field_for(self, user_id):
+        """Name of the unread counter column belonging to a participant"""
+        if user_id == self.participant_1_id:
+            return 'unread_for_p1'
+        return 'unread_for_p2'
     
     def get_unread_count(self, user):
         """Get unread message count for a user"""
-        return self.messages.filter(sender__ne=user, read=False).count()
+        return getattr(self, self.unread_field_for(user.id))
     
     def mark_as_read(self, user):
         """Mark all messages as read for a user"""
-        self.messages.filter(sender__ne=user, read=False).update(read=True)
+        from django.utils import timezone
+        self.messages.exclude(sender=user).filter(read=False).update(read=True, read_at=timezone.now())
+        
+        field = self.unread_field_for(user.id)
+        Conversation.objects.filter(pk=self.pk).update(**{field: 0})
+        setattr(self, field, 0)
 
 
 class Message(models.Model):
@@ -146,12 +178,32 @@ class Message(models.Model):
     
     def save(self, *args, **kwargs):
         # Update conversation's last_message_at
-        is_new = self.pk is None
+        # (pk is pre-populated by the uuid default, so check _state instead)
+        is_new = self._state.adding
         super().save(*args, **kwargs)
         
         if is_new:
-            self.conversation.last_message_at = self.created_at
-            self.conversation.save(update_fields=['last_message_at', 'updated_at'])
+            from django.utils import timezone
+            conversation = self.conversation
+            conversation.last_message_at = self.created_at
+            conversation.updated_at = timezone.now()
+            changes = {
+                'last_message_at': conversation.last_message_at,
+                'updated_at': conversation.updated_at,
+            }
+            
+            # Bump the recipient's unread counter in the same UPDATE
+            if not self.read:
+                field = self.recipient_unread_field()
+                changes[field] = F(field) + 1
+            
+            Conversation.objects.filter(pk=conversation.pk).update(**changes)
+    
+    def recipient_unread_field(self):
+        """Unread counter column of the participant receiving this message"""
+        if self.sender_id == self.conversation.participant_1_id:
+            return 'unread_for_p2'
+        return 'unread_for_p1'
     
     def mark_as_read(self):
         """Mark message as read"""
@@ -160,6 +212,11 @@ class Message(models.Model):
             self.read = True
             self.read_at = timezone.now()
             self.save(update_fields=['read', 'read_at'])
+            
+            field = self.recipient_unread_field()
+            Conversation.objects.filter(
+                pk=self.conversation_id, **{f'{field}__gt': 0}
+            ).update(**{field: F(field) - 1})
 
 
 class ProjectViewRequest(models.Model):
@@ -225,6 +282,16 @@ class ProjectViewRequest(models.Model):
         ordering = ['-created_at']
         # Prevent duplicate requests for same project to same person
         unique_together = [['project', 'recipient']]
+        indexes = [
+            models.Index(fields=['recipient', 'status', '-created_at']),
+            models.Index(fields=['requester', '-created_at']),
+            # Pending requests per recipient (inbox stats)
+            models.Index(
+                fields=['recipient', '-created_at'],
+                condition=models.Q(status='pending'),
+                name='msg_pvr_pending_recipient_idx'
+            ),
+        ]
     
     def __str__(self):
         return f"{self.requester.username} → {self.recipient.username}: {self.project.title}"
@@ -22,11 +22,13 @@ class MessageSerializer(serializers.ModelSerializer):
     def validate(self, data):
         """Validate message sending permissions"""
         request = self.context.get('request')
-        conversation_id = data.get('conversation')
+        conversation = data.get('conversation')
         
-        if request and conversation_id:
+        if request and conversation:
             try:
-                conversation = Conversation.objects.get(id=conversation_id.id if hasattr(conversation_id, 'id') else conversation_id)
+                # The related field has usually resolved the instance already
+                if not isinstance(conversation, Conversation):
+                    conversation = Conversation.objects.get(id=conversation)
                 
                 # Check if user is participant
                 if not conversation.is_participant(request.user):
@@ -70,6 +72,9 @@ class ConversationListSerializer(serializers.ModelSerializer):
             'updated_at', 'last_message_at', 'last_message', 'unread_count'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at', 'last_message_at']
+        optimizations = {
+            'other_participant': ['participant_1__profile', 'participant_2__profile'],
+        }
     
     def get_other_participant(self, obj):
         """Get the other participant from current user's perspective"""
@@ -81,6 +86,18 @@ class ConversationListSerializer(serializers.ModelSerializer):
     
     def get_last_message(self, obj):
         """Get the last message in the conversation"""
+        # Use the subquery annotations from ConversationListView when present
+        if hasattr(obj, 'last_message_id'):
+            if obj.last_message_id is None:
+                return None
+            return {
+                'id': str(obj.last_message_id),
+                'content': obj.last_message_preview,
+                'sender_id': obj.last_message_sender_id,
+                'created_at': obj.last_message_created_at,
+                'read': obj.last_message_read
+            }
+        
         last_msg = obj.messages.order_by('-created_at').first()
         if last_msg:
             return {
@@ -94,9 +111,12 @@ class ConversationListSerializer(serializers.ModelSerializer):
     
     def get_unread_count(self, obj):
         """Get unread message count for current user"""
+        if hasattr(obj, 'unread_count'):
+            return obj.unread_count
+        
         request = self.context.get('request')
         if request and request.user:
-            return obj.messages.exclude(sender=request.user).filter(read=False).count()
+            return obj.get_unread_count(request.user)
         return 0
 
 
@@ -106,7 +126,7 @@ class ConversationDetailSerializer(serializers.ModelSerializer):
     participant_1 = UserProfileSerializer(read_only=True)
     participant_2 = UserProfileSerializer(read_only=True)
     other_participant = serializers.SerializerMethodField()
-    messages = MessageSerializer(many=True, read_only=True)
+    messages = serializers.SerializerMethodField()
     related_project = ProjectSerializer(read_only=True)
     can_send_message = serializers.SerializerMethodField()
     
@@ -118,6 +138,9 @@ class ConversationDetailSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at', 'last_message_at', 'can_send_message'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at', 'last_message_at']
+        optimizations = {
+            'other_participant': ['participant_1__profile', 'participant_2__profile'],
+        }
     
     def get_other_participant(self, obj):
         """Get the other participant from current user's perspective"""
@@ -127,6 +150,13 @@ class ConversationDetailSerializer(serializers.ModelSerializer):
             return UserProfileSerializer(other).data
         return None
     
+    def get_messages(self, obj):
+        """Serialize the page of messages chosen by the view, or the whole thread"""
+        messages = self.context.get('messages')
+        if messages is None:
+            messages = obj.messages.all()
+        return MessageSerializer(messages, many=True, context=self.context).data
+    
     def get_can_send_message(self, obj):
         """Check if current user can send messages in this conversation"""
         request = self.context.get('request')
@@ -228,6 +258,10 @@ class ProjectViewRequestSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at', 'responded_at'
         ]
         read_only_fields = ['id', 'requester', 'status', 'conversation', 'created_at', 'updated_at', 'responded_at']
+        optimizations = {
+            'requester': ['requester__profile'],
+            'recipient': ['recipient__profile'],
+        }
     
     def validate_recipient_id(self, value):
         """Validate recipient exists and has correct role"""
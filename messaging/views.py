@@ -1,10 +1,14 @@
 from rest_framework import generics, status, permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
-from django.db.models import Q, Max
-from django.shortcuts import get_object_or_404
+from django.db.models import Q, Max, OuterRef, Subquery, F, Sum, Case, When
+from django.db.models.functions import Substr
 from django.contrib.auth.models import User
+from django.db import transaction
+from django.http import Http404
 from .models import Conversation, Message, ProjectViewRequest, MessagePermission
+from entrehive_backend.optimizations import optimize_queryset
+import uuid
 from .serializers import (
     ConversationListSerializer, ConversationDetailSerializer,
     MessageSerializer, ProjectViewRequestSerializer,
@@ -12,6 +16,10 @@ from .serializers import (
 )
 
 
+# Number of messages returned per page of a conversation thread
+MESSAGES_PAGE_SIZE = 50
+
+
 class ConversationListView(generics.ListAPIView):
     """
     List all conversations for the current user (inbox)
@@ -23,39 +31,42 @@ class ConversationListView(generics.ListAPIView):
     def get_queryset(self):
         user = self.request.user
         
-        # Get all conversations where user is a participant
-        queryset = Conversation.objects.filter(
-            Q(participant_1=user) | Q(participant_2=user)
-        ).select_related(
-            'participant_1', 'participant_1__profile',
-            'participant_2', 'participant_2__profile',
-            'related_project', 'related_project__owner'
-        ).prefetch_related(
-            'messages'
-        )
+        # Latest message per conversation, resolved in SQL so the inbox
+        # never has to load whole message threads
+        latest_message = Message.objects.filter(
+            conversation=OuterRef('pk')
+        ).order_by('-created_at')
         
-        # Filter by status if provided
+        # Show archived conversations if requested, otherwise active ones
+        # (not archived by user)
         status_filter = self.request.query_params.get('status', None)
-        if status_filter == 'archived':
-            # Show archived conversations
-            queryset = queryset.filter(
-                Q(participant_1=user, archived_by_p1=True) |
-                Q(participant_2=user, archived_by_p2=True)
-            )
-        else:
-            # Show active conversations (not archived by user)
-            queryset = queryset.exclude(
-                Q(participant_1=user, archived_by_p1=True) |
-                Q(participant_2=user, archived_by_p2=True)
-            )
+        archived = status_filter == 'archived'
+        
+        queryset = optimize_queryset(
+            Conversation.objects.filter(Conversation.archived_filter(user, archived)),
+            ConversationListSerializer
+        ).annotate(
+            last_message_id=Subquery(latest_message.values('id')[:1]),
+            last_message_preview=Subquery(
+                latest_message.annotate(preview=Substr('content', 1, 100)).values('preview')[:1]
+            ),
+            last_message_sender_id=Subquery(latest_message.values('sender_id')[:1]),
+            last_message_created_at=Subquery(latest_message.values('created_at')[:1]),
+            last_message_read=Subquery(latest_message.values('read')[:1]),
+            unread_count=Case(
+                When(participant_1=user, then=F('unread_for_p1')),
+                default=F('unread_for_p2')
+            ),
+        )
         
         return queryset.order_by('-last_message_at', '-created_at')
 
 
 class ConversationDetailView(generics.RetrieveAPIView):
     """
-    Get detailed conversation with all messages
+    Get detailed conversation with its most recent messages
     GET /api/messaging/conversations/<conversation_id>/
+    Query params: before=<message_id> to page back through older messages
     """
     serializer_class = ConversationDetailSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -69,25 +80,51 @@ class ConversationDetailView(generics.RetrieveAPIView):
             'participant_1', 'participant_1__profile',
             'participant_2', 'participant_2__profile',
             'related_project'
-        ).prefetch_related(
-            'messages', 'messages__sender', 'messages__sender__profile'
         )
     
     def retrieve(self, request, *args, **kwargs):
-        """Override to mark messages as read"""
+        """Override to page messages and mark them as read"""
         instance = self.get_object()
         
-        # Mark all messages as read for current user
-        Message.objects.filter(
+        messages = Message.objects.filter(
             conversation=instance
-        ).exclude(
-            sender=request.user
-        ).filter(
-            read=False
-        ).update(read=True)
+        ).select_related('sender', 'sender__profile')
+        
+        # Cursor: only messages older than the given message
+        before = request.query_params.get('before', None)
+        if before:
+            try:
+                before = uuid.UUID(before)
+            except ValueError:
+                return Response(
+                    {'error': 'Invalid message id for before'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            messages = messages.filter(
+                created_at__lt=Subquery(
+                    Message.objects.filter(
+                        conversation=instance, id=before
+                    ).values('created_at')[:1]
+                )
+            )
+        
+        # Mark all messages as read for current user before loading the page,
+        # so the response shows them as read
+        instance.mark_as_read(request.user)
+        
+        # Fetch one extra row to know whether older messages remain
+        page = list(messages.order_by('-created_at')[:MESSAGES_PAGE_SIZE + 1])
+        has_more_messages = len(page) > MESSAGES_PAGE_SIZE
+        page = page[:MESSAGES_PAGE_SIZE]
+        page.reverse()
         
-        serializer = self.get_serializer(instance)
-        return Response(serializer.data)
+        serializer = self.get_serializer(
+            instance,
+            context={**self.get_serializer_context(), 'messages': page}
+        )
+        data = serializer.data
+        data['has_more_messages'] = has_more_messages
+        return Response(data)
 
 
 class CreateConversationView(generics.CreateAPIView):
@@ -196,13 +233,24 @@ class MessageListCreateView(generics.ListCreateAPIView):
     serializer_class = MessageSerializer
     permission_classes = [permissions.IsAuthenticated]
     
+    def _user_in_conversation(self, conversation_id, user):
+        """
+        Check participation reading only the participant ids; 404 when the
+        conversation doesn't exist
+        """
+        participants = Conversation.objects.filter(id=conversation_id).values(
+            'participant_1_id', 'participant_2_id'
+        ).first()
+        if participants is None:
+            raise Http404('No Conversation matches the given query.')
+        return user.id in participants.values()
+    
     def get_queryset(self):
         conversation_id = self.kwargs.get('conversation_id')
         user = self.request.user
         
         # Verify user is participant
-        conversation = get_object_or_404(Conversation, id=conversation_id)
-        if not conversation.is_participant(user):
+        if not self._user_in_conversation(conversation_id, user):
             return Message.objects.none()
         
         return Message.objects.filter(
@@ -220,9 +268,8 @@ class MessageListCreateView(generics.ListCreateAPIView):
         """Send a message in the conversation"""
         conversation_id = self.kwargs.get('conversation_id')
         
-        # Get conversation and verify participant
-        conversation = get_object_or_404(Conversation, id=conversation_id)
-        if not conversation.is_participant(request.user):
+        # Verify participant
+        if not self._user_in_conversation(conversation_id, request.user):
             return Response(
                 {'error': 'You are not a participant in this conversation'},
                 status=status.HTTP_403_FORBIDDEN
@@ -309,9 +356,8 @@ class ProjectViewRequestListCreateView(generics.ListCreateAPIView):
         if status_filter:
             queryset = queryset.filter(status=status_filter)
         
-        return queryset.select_related(
-            'project', 'project__owner', 'requester', 'requester__profile',
-            'recipient', 'recipient__profile', 'conversation'
+        return optimize_queryset(
+            queryset, ProjectViewRequestSerializer
         ).order_by('-created_at')
 
 
@@ -334,6 +380,29 @@ class ProjectViewRequestDetailView(generics.RetrieveAPIView):
         )
 
 
+def _lock_project_request(request_id):
+    """
+    Lock a project view request row for the current transaction.
+    Returns (view_request, error_response); rows locked by a concurrent
+    response are skipped rather than waited on.
+    """
+    try:
+        view_request = ProjectViewRequest.objects.select_for_update(
+            skip_locked=True
+        ).get(id=request_id)
+    except ProjectViewRequest.DoesNotExist:
+        if ProjectViewRequest.objects.filter(id=request_id).exists():
+            return None, Response(
+                {'error': 'This request is already being processed'},
+                status=status.HTTP_409_CONFLICT
+            )
+        return None, Response(
+            {'error': 'Project view request not found'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    return view_request, None
+
+
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
 def respond_to_project_request(request, request_id):
@@ -342,53 +411,50 @@ def respond_to_project_request(request, request_id):
     POST /api/messaging/project-requests/<request_id>/respond/
     Body: {"action": "accept" or "decline"}
     """
-    try:
-        view_request = ProjectViewRequest.objects.get(id=request_id)
-    except ProjectViewRequest.DoesNotExist:
-        return Response(
-            {'error': 'Project view request not found'},
-            status=status.HTTP_404_NOT_FOUND
-        )
-    
-    # Verify user is the recipient
-    if view_request.recipient != request.user:
-        return Response(
-            {'error': 'You are not the recipient of this request'},
-            status=status.HTTP_403_FORBIDDEN
-        )
-    
-    # Validate action
-    serializer = ProjectViewRequestResponseSerializer(data=request.data)
-    serializer.is_valid(raise_exception=True)
-    
-    action = serializer.validated_data['action']
-    
-    if action == 'accept':
-        success = view_request.accept()
-        if success:
-            # Grant messaging permission to student
-            if view_request.conversation:
-                MessagePermission.grant_permission(
-                    from_user=view_request.requester,
-                    to_user=view_request.recipient,
-                    conversation=view_request.conversation,
-                    grant_type='request_accepted'
-                )
-            
-            return Response(
-                {
-                    'message': 'Project view request accepted',
-                    'conversation_id': str(view_request.conversation.id) if view_request.conversation else None
-                },
-                status=status.HTTP_200_OK
-            )
-    elif action == 'decline':
-        success = view_request.decline()
-        if success:
+    with transaction.atomic():
+        view_request, error_response = _lock_project_request(request_id)
+        if error_response:
+            return error_response
+        
+        # Verify user is the recipient
+        if view_request.recipient_id != request.user.id:
             return Response(
-                {'message': 'Project view request declined'},
-                status=status.HTTP_200_OK
+                {'error': 'You are not the recipient of this request'},
+                status=status.HTTP_403_FORBIDDEN
             )
+        
+        # Validate action
+        serializer = ProjectViewRequestResponseSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        action = serializer.validated_data['action']
+        
+        if action == 'accept':
+            success = view_request.accept()
+            if success:
+                # Grant messaging permission to student
+                if view_request.conversation:
+                    MessagePermission.grant_permission(
+                        from_user=view_request.requester,
+                        to_user=view_request.recipient,
+                        conversation=view_request.conversation,
+                        grant_type='request_accepted'
+                    )
+                
+                return Response(
+                    {
+                        'message': 'Project view request accepted',
+                        'conversation_id': str(view_request.conversation.id) if view_request.conversation else None
+                    },
+                    status=status.HTTP_200_OK
+                )
+        elif action == 'decline':
+            success = view_request.decline()
+            if success:
+                return Response(
+                    {'message': 'Project view request declined'},
+                    status=status.HTTP_200_OK
+                )
     
     return Response(
         {'error': 'Invalid action or request cannot be processed'},
@@ -403,22 +469,20 @@ def cancel_project_request(request, request_id):
     Cancel a project view request (by requester)
     POST /api/messaging/project-requests/<request_id>/cancel/
     """
-    try:
-        view_request = ProjectViewRequest.objects.get(id=request_id)
-    except ProjectViewRequest.DoesNotExist:
-        return Response(
-            {'error': 'Project view request not found'},
-            status=status.HTTP_404_NOT_FOUND
-        )
-    
-    # Verify user is the requester
-    if view_request.requester != request.user:
-        return Response(
-            {'error': 'You are not the requester of this request'},
-            status=status.HTTP_403_FORBIDDEN
-        )
+    with transaction.atomic():
+        view_request, error_response = _lock_project_request(request_id)
+        if error_response:
+            return error_response
+        
+        # Verify user is the requester
+        if view_request.requester_id != request.user.id:
+            return Response(
+                {'error': 'You are not the requester of this request'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        success = view_request.cancel()
     
-    success = view_request.cancel()
     if success:
         return Response(
             {'message': 'Project view request cancelled'},
@@ -440,12 +504,15 @@ def inbox_stats(request):
     """
     user = request.user
     
-    # Count unread messages
-    unread_messages = Message.objects.filter(
-        conversation__in=Conversation.objects.filter(
-            Q(participant_1=user) | Q(participant_2=user)
-        )
-    ).exclude(sender=user).filter(read=False).count()
+    # Count unread messages from the denormalized per-participant counters
+    unread_messages = Conversation.objects.filter(
+        Q(participant_1=user) | Q(participant_2=user)
+    ).aggregate(
+        total=Sum(Case(
+            When(participant_1=user, then=F('unread_for_p1')),
+            default=F('unread_for_p2')
+        ))
+    )['total'] or 0
     
     # Count pending requests
     pending_requests = ProjectViewRequest.objects.filter(
@@ -455,10 +522,7 @@ def inbox_stats(request):
     
     # Count active conversations
     active_conversations = Conversation.objects.filter(
-        Q(participant_1=user) | Q(participant_2=user)
-    ).exclude(
-        Q(participant_1=user, archived_by_p1=True) |
-        Q(participant_2=user, archived_by_p2=True)
+        Conversation.archived_filter(user, False)
     ).count()
     
     return Response({
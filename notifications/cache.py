@@ -0,0 +1,37 @@
+"""
+Caching for the notification list endpoint.
+
+Rendered JSON bytes are cached per user and query string. Each user has a
+version token that is part of every key; bumping it invalidates all of
+that user's cached pages at once. The list is only cached on a backend
+shared by all workers (see shared_cache_enabled).
+"""
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.utils.http import urlencode
+
+from entrehive_backend.cache import shared_cache_enabled
+
+
+LIST_CACHE_TIMEOUT = 30  # seconds
+
+
+def _version_key(user_id):
+    return f'notif:list:version:{user_id}'
+
+
+def list_cache_key(user_id, query_params):
+    """Build the cache key for a user's notification list request"""
+    version = cache.get_or_set(_version_key(user_id), time.time_ns, None)
+    params = urlencode(sorted(query_params.lists()), doseq=True)
+    digest = hashlib.md5(params.encode()).hexdigest()
+    return f'notif:list:{user_id}:{version}:{digest}'
+
+
+def invalidate_list_cache(user_id):
+    """Drop every cached notification list page for a user"""
+    if not shared_cache_enabled():
+        return
+    cache.set(_version_key(user_id), time.time_ns(), None)
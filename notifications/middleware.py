@@ -0,0 +1,54 @@
+import logging
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+
+from .models import Notification
+
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationQueueMiddleware:
+    """
+    Buffer notifications created during a request and write them with a
+    single bulk INSERT once a successful response is ready. If the view
+    raises or responds with an error, the queued notifications are dropped.
+    Supports both sync and async request handling.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        Notification.start_queue()
+        try:
+            response = self.get_response(request)
+        except Exception:
+            Notification.stop_queue(flush=False)
+            raise
+        self.finish_queue(response)
+        return response
+
+    async def __acall__(self, request):
+        Notification.start_queue()
+        try:
+            response = await self.get_response(request)
+        except Exception:
+            Notification.stop_queue(flush=False)
+            raise
+        await sync_to_async(self.finish_queue)(response)
+        return response
+
+    def finish_queue(self, response):
+        """Write the queued notifications only for a successful response"""
+        try:
+            Notification.stop_queue(flush=response.status_code < 400)
+        except Exception:
+            # The triggering action already succeeded; don't fail the response
+            logger.exception("Failed to write queued notifications")
@@ -1,8 +1,17 @@
 from django.db import models
 from django.contrib.auth.models import User
+from asgiref.local import Local
+from .cache import invalidate_list_cache
 import uuid
 
 
+# Notifications queued during the current request (see NotificationQueueMiddleware)
+_queue = Local()
+
+# Maximum number of queued notifications written per INSERT
+QUEUE_BATCH_SIZE = 500
+
+
 class Notification(models.Model):
     """
     Notification model to store user notifications
@@ -61,16 +70,72 @@ class Notification(models.Model):
     def __str__(self):
         return f"{self.notification_type} for {self.recipient.username}"
     
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        invalidate_list_cache(self.recipient_id)
+    
+    def delete(self, *args, **kwargs):
+        recipient_id = self.recipient_id
+        result = super().delete(*args, **kwargs)
+        invalidate_list_cache(recipient_id)
+        return result
+    
     def mark_as_read(self):
         """Mark notification as read"""
         if not self.is_read:
             self.is_read = True
             self.save(update_fields=['is_read'])
     
+    @classmethod
+    def start_queue(cls):
+        """Start buffering notifications created via enqueue()"""
+        _queue.pending = []
+    
+    @classmethod
+    def flush_queue(cls):
+        """Write all buffered notifications with bulk INSERTs"""
+        pending = getattr(_queue, 'pending', None)
+        if not pending:
+            return
+        _queue.pending = []
+        cls.objects.bulk_create(pending, batch_size=QUEUE_BATCH_SIZE)
+        for recipient_id in {n.recipient_id for n in pending}:
+            invalidate_list_cache(recipient_id)
+    
+    @classmethod
+    def stop_queue(cls, flush=True):
+        """
+        Stop buffering notifications, writing the pending ones unless flush
+        is False (the request failed, so the actions they report may not
+        have been saved)
+        """
+        try:
+            if flush:
+                cls.flush_queue()
+        finally:
+            _queue.pending = None
+    
+    @classmethod
+    def enqueue(cls, **fields):
+        """
+        Create a notification, deferring the INSERT to the end of the request
+        when a queue is active. Outside a request it is saved immediately.
+        """
+        notification = cls(**fields)
+        pending = getattr(_queue, 'pending', None)
+        if pending is None:
+            notification.save()
+            return notification
+        
+        pending.append(notification)
+        if len(pending) >= QUEUE_BATCH_SIZE:
+            cls.flush_queue()
+        return notification
+    
     @classmethod
     def create_follow_notification(cls, follower, following):
         """Create a notification when someone follows a user"""
-        return cls.objects.create(
+        return cls.enqueue(
             recipient=following,
             sender=follower,
             notification_type='follow',
@@ -82,7 +147,7 @@ class Notification(models.Model):
     @classmethod
     def create_like_notification(cls, liker, post_author, post_id):
         """Create a notification when someone likes a post"""
-        return cls.objects.create(
+        return cls.enqueue(
             recipient=post_author,
             sender=liker,
             notification_type='like',
@@ -95,7 +160,7 @@ class Notification(models.Model):
     @classmethod
     def create_comment_notification(cls, commenter, post_author, post_id, comment_id):
         """Create a notification when someone comments on a post"""
-        return cls.objects.create(
+        return cls.enqueue(
             recipient=post_author,
             sender=commenter,
             notification_type='comment',
@@ -109,7 +174,7 @@ class Notification(models.Model):
     @classmethod
     def create_project_invite_notification(cls, inviter, invitee, project_id, project_title):
         """Create a notification when someone invites a user to a project"""
-        return cls.objects.create(
+        return cls.enqueue(
             recipient=invitee,
             sender=inviter,
             notification_type='project_invite',
@@ -2,6 +2,20 @@ from rest_framework import serializers
 from .models import Notification
 
 
+def get_url_prefix(request):
+    """Return the scheme and host used to build absolute media URLs"""
+    if request is None:
+        return ''
+    return request.build_absolute_uri('/').rstrip('/')
+
+
+def build_media_url(url, url_prefix):
+    """Join a storage URL to the precomputed prefix (absolute URLs pass through)"""
+    if url.startswith('/'):
+        return url_prefix + url
+    return url
+
+
 class SimpleUserSerializer(serializers.Serializer):
     """Simple serializer for user in notifications"""
     id = serializers.IntegerField(read_only=True)
@@ -9,15 +23,19 @@ class SimpleUserSerializer(serializers.Serializer):
     first_name = serializers.CharField(read_only=True)
     last_name = serializers.CharField(read_only=True)
     
+    class Meta:
+        optimizations = {
+            'profile_picture': ['profile'],
+        }
+    
     def to_representation(self, instance):
         data = super().to_representation(instance)
         # Add profile picture if available
         if hasattr(instance, 'profile') and instance.profile.profile_picture:
-            request = self.context.get('request')
-            if request:
-                data['profile_picture'] = request.build_absolute_uri(instance.profile.profile_picture.url)
-            else:
-                data['profile_picture'] = instance.profile.profile_picture.url
+            url_prefix = self.context.get('url_prefix')
+            if url_prefix is None:
+                url_prefix = get_url_prefix(self.context.get('request'))
+            data['profile_picture'] = build_media_url(instance.profile.profile_picture.url, url_prefix)
         else:
             data['profile_picture'] = None
         return data
@@ -36,24 +54,30 @@ class NotificationSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at']
 
 
-class NotificationListSerializer(serializers.ModelSerializer):
-    """Lightweight serializer for notification lists"""
-    sender_username = serializers.CharField(source='sender.username', read_only=True)
-    sender_full_name = serializers.CharField(source='sender.get_full_name', read_only=True)
-    sender_profile_picture = serializers.SerializerMethodField()
-    
-    class Meta:
-        model = Notification
-        fields = [
-            'id', 'notification_type', 'title', 'message', 
-            'sender_username', 'sender_full_name', 'sender_profile_picture',
-            'action_url', 'is_read', 'created_at'
-        ]
-    
-    def get_sender_profile_picture(self, obj):
-        if obj.sender and hasattr(obj.sender, 'profile') and obj.sender.profile.profile_picture:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.sender.profile.profile_picture.url)
-        return None
+def serialize_notification(notification, url_prefix=None):
+    """
+    Build the list representation of a notification as a plain dict.
+    Used by the list endpoint instead of a ModelSerializer, which is much
+    slower when rendering hundreds of rows. `url_prefix` comes from
+    get_url_prefix() and is computed once per request.
+    """
+    sender = notification.sender
+    return {
+        'id': str(notification.id),
+        'notification_type': notification.notification_type,
+        'title': notification.title,
+        'message': notification.message,
+        'sender_username': sender.username if sender else None,
+        'sender_full_name': f"{sender.first_name} {sender.last_name}".strip() if sender else None,
+        'sender_profile_picture': get_sender_profile_picture(sender, url_prefix),
+        'action_url': notification.action_url,
+        'is_read': notification.is_read,
+        'created_at': notification.created_at,
+    }
+
 
+def get_sender_profile_picture(sender, url_prefix=None):
+    """Return absolute URL for the sender's profile picture"""
+    if url_prefix is not None and sender and hasattr(sender, 'profile') and sender.profile.profile_picture:
+        return build_media_url(sender.profile.profile_picture.url, url_prefix)
+    return None
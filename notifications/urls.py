@@ -1,12 +1,13 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import NotificationViewSet, get_follow_suggestions
+from .views import NotificationViewSet, get_follow_suggestions, unread_count
 
 router = DefaultRouter()
 router.register(r'', NotificationViewSet, basename='notification')
 
 urlpatterns = [
     path('follow-suggestions/', get_follow_suggestions, name='follow-suggestions'),
+    path('unread_count/', unread_count, name='notification-unread-count'),
     path('', include(router.urls)),
 ]
 
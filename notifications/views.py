@@ -1,10 +1,25 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.exceptions import APIException
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.request import Request
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from asgiref.sync import sync_to_async
 from django.db.models import Q
+from django.http import HttpResponse, JsonResponse
+from rest_framework.renderers import JSONRenderer
+from django.views.decorators.http import require_GET
 from .models import Notification
-from .serializers import NotificationSerializer, NotificationListSerializer
+from entrehive_backend.optimizations import optimize_queryset
+from .serializers import NotificationSerializer, serialize_notification, get_url_prefix
+from .cache import LIST_CACHE_TIMEOUT, list_cache_key, invalidate_list_cache
+from django.core.cache import cache
+from entrehive_backend.cache import shared_cache_enabled
+
+
+# Rows removed per DELETE statement when clearing read notifications
+DELETE_BATCH_SIZE = 10000
 
 
 class NotificationViewSet(viewsets.ModelViewSet):
@@ -16,18 +31,25 @@ class NotificationViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         """Return notifications for the current user"""
-        return Notification.objects.filter(
-            recipient=self.request.user
-        ).select_related('sender', 'sender__profile').order_by('-created_at')
+        queryset = Notification.objects.filter(recipient=self.request.user)
+        return optimize_queryset(queryset, NotificationSerializer).order_by('-created_at')
     
-    def get_serializer_class(self):
-        """Use list serializer for list actions"""
-        if self.action == 'list':
-            return NotificationListSerializer
-        return NotificationSerializer
+    def get_serializer_context(self):
+        """Compute the media URL prefix once per request"""
+        context = super().get_serializer_context()
+        context['url_prefix'] = get_url_prefix(self.request)
+        return context
     
     def list(self, request, *args, **kwargs):
         """Get all notifications for current user"""
+        # Serve the pre-rendered JSON body when it is cached
+        use_cache = shared_cache_enabled()
+        if use_cache:
+            cache_key = list_cache_key(request.user.id, request.query_params)
+            body = cache.get(cache_key)
+            if body is not None:
+                return HttpResponse(body, content_type='application/json')
+        
         queryset = self.get_queryset()
         
         # Filter by read status if specified
@@ -40,7 +62,9 @@ class NotificationViewSet(viewsets.ModelViewSet):
         if limit:
             queryset = queryset[:int(limit)]
         
-        serializer = self.get_serializer(queryset, many=True)
+        # Build plain dicts instead of going through a ModelSerializer
+        url_prefix = get_url_prefix(request)
+        notifications = [serialize_notification(n, url_prefix) for n in queryset]
         
         # Get unread count
         unread_count = Notification.objects.filter(
@@ -48,11 +72,14 @@ class NotificationViewSet(viewsets.ModelViewSet):
             is_read=False
         ).count()
         
-        return Response({
-            'notifications': serializer.data,
+        body = JSONRenderer().render({
+            'notifications': notifications,
             'unread_count': unread_count,
             'total_count': self.get_queryset().count()
         })
+        if use_cache:
+            cache.set(cache_key, body, LIST_CACHE_TIMEOUT)
+        return HttpResponse(body, content_type='application/json')
     
     @action(detail=True, methods=['post'])
     def mark_as_read(self, request, pk=None):
@@ -68,25 +95,62 @@ class NotificationViewSet(viewsets.ModelViewSet):
             recipient=request.user,
             is_read=False
         ).update(is_read=True)
+        invalidate_list_cache(request.user.id)
         return Response({'status': f'{count} notifications marked as read'})
     
     @action(detail=False, methods=['delete'])
     def delete_all_read(self, request):
         """Delete all read notifications for current user"""
-        count, _ = Notification.objects.filter(
-            recipient=request.user,
-            is_read=True
-        ).delete()
+        # Delete in bounded batches so a large backlog doesn't hold one
+        # long-running DELETE
+        count = 0
+        while True:
+            ids = list(
+                Notification.objects.filter(
+                    recipient=request.user,
+                    is_read=True
+                ).values_list('id', flat=True)[:DELETE_BATCH_SIZE]
+            )
+            if not ids:
+                break
+            deleted, _ = Notification.objects.filter(id__in=ids).delete()
+            count += deleted
+        invalidate_list_cache(request.user.id)
         return Response({'status': f'{count} notifications deleted'})
+
+
+def _authenticate(request):
+    """Run the configured DRF authenticators against a plain Django request"""
+    drf_request = Request(
+        request,
+        authenticators=[auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES]
+    )
+    try:
+        user = drf_request.user
+    except APIException:
+        return None
+    return user if user.is_authenticated else None
+
+
+@require_GET
+async def unread_count(request):
+    """
+    Get count of unread notifications
+    GET /api/notifications/unread_count/
+    Async so frequent polling doesn't tie up a worker per request under ASGI
+    """
+    user = await sync_to_async(_authenticate)(request)
+    if user is None:
+        return JsonResponse(
+            {'detail': 'Authentication credentials were not provided.'},
+            status=status.HTTP_401_UNAUTHORIZED
+        )
     
-    @action(detail=False, methods=['get'])
-    def unread_count(self, request):
-        """Get count of unread notifications"""
-        count = Notification.objects.filter(
-            recipient=request.user,
-            is_read=False
-        ).count()
-        return Response({'unread_count': count})
+    count = await Notification.objects.filter(
+        recipient=user,
+        is_read=False
+    ).acount()
+    return JsonResponse({'unread_count': count})
 
 
 @api_view(['GET'])
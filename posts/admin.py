@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import Post, Comment, Like, PostShare
+from django.db.models.functions import Length, Substr
+from .models import Post, Comment, Like, PostShare, Hashtag
 
 
 @admin.register(Post)
@@ -9,19 +10,19 @@ class PostAdmin(admin.ModelAdmin):
     search_fields = ['content', 'author__username', 'author__profile__first_name', 'author__profile__last_name']
     readonly_fields = ['id', 'created_at', 'updated_at', 'likes_count', 'comments_count']
     filter_horizontal = ['tagged_projects']
+    list_select_related = ['author']
     date_hierarchy = 'created_at'
     
+    def get_queryset(self, request):
+        # Only the preview prefix of content is read; the full text is deferred
+        return super().get_queryset(request).annotate(
+            _content_preview=Substr('content', 1, 50),
+            _content_length=Length('content')
+        ).defer('content')
+    
     def content_preview(self, obj):
-        return obj.content[:50] + "..." if len(obj.content) > 50 else obj.content
+        return obj.get_content_preview()
     content_preview.short_description = 'Content Preview'
-    
-    def likes_count(self, obj):
-        return obj.get_likes_count()
-    likes_count.short_description = 'Likes'
-    
-    def comments_count(self, obj):
-        return obj.get_comments_count()
-    comments_count.short_description = 'Comments'
 
 
 @admin.register(Comment)
@@ -31,10 +32,19 @@ class CommentAdmin(admin.ModelAdmin):
     search_fields = ['content', 'author__username', 'post__content']
     readonly_fields = ['id', 'created_at', 'updated_at']
     raw_id_fields = ['post', 'parent']
+    # Comment and Post __str__ read their author (and the parent's post author)
+    list_select_related = ['author', 'post__author', 'parent__author', 'parent__post__author']
     date_hierarchy = 'created_at'
     
+    def get_queryset(self, request):
+        # Only the preview prefix of content is read; the full text is deferred
+        return super().get_queryset(request).annotate(
+            _content_preview=Substr('content', 1, 30),
+            _content_length=Length('content')
+        ).defer('content')
+    
     def content_preview(self, obj):
-        return obj.content[:30] + "..." if len(obj.content) > 30 else obj.content
+        return obj.get_content_preview()
     content_preview.short_description = 'Content Preview'
 
 
@@ -45,6 +55,7 @@ class LikeAdmin(admin.ModelAdmin):
     search_fields = ['user__username', 'post__content']
     readonly_fields = ['id', 'created_at']
     raw_id_fields = ['post']
+    list_select_related = ['user', 'post__author']
     date_hierarchy = 'created_at'
 
 
@@ -55,4 +66,11 @@ class PostShareAdmin(admin.ModelAdmin):
     search_fields = ['user__username', 'post__content']
     readonly_fields = ['id', 'created_at']
     raw_id_fields = ['post']
-    date_hierarchy = 'created_at'
\ No newline at end of file
+    list_select_related = ['user', 'post__author']
+    date_hierarchy = 'created_at'
+
+@admin.register(Hashtag)
+class HashtagAdmin(admin.ModelAdmin):
+    list_display = ['name', 'usage_count']
+    search_fields = ['name']
+    readonly_fields = ['id', 'usage_count']
@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class PostsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'posts'
+    
+    def ready(self):
+        """
+        Import signals when the app is ready
+        """
+        import posts.signals  # noqa
\ No newline at end of file
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from posts.models import Post, Comment, Like
+
+
+class Command(BaseCommand):
+    help = 'Recompute the denormalized likes/comments counts on posts to heal drift'
+
+    def handle(self, *args, **options):
+        self.stdout.write(" Recounting post likes and comments...")
+        
+        likes = Like.objects.filter(post=OuterRef('pk')).values('post').annotate(total=Count('id')).values('total')
+        comments = Comment.objects.filter(post=OuterRef('pk')).values('post').annotate(total=Count('id')).values('total')
+        
+        updated = Post.objects.update(
+            likes_count=Coalesce(Subquery(likes[:1]), 0),
+            comments_count=Coalesce(Subquery(comments[:1]), 0)
+        )
+        
+        self.stdout.write(self.style.SUCCESS(f" Recounted {updated} posts"))
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.6 on 2026-10-15 22:42
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0002_add_search_indexes'),
+        ('projects', '0005_add_search_indexes'),
+        ('universities', '0002_remove_university_allow_cross_university_collaboration_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['visibility', 'author'], name='posts_post_visibil_740092_idx'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated manually for search optimization
+
+from django.db import migrations
+
+
+# post_search filters with content__icontains, which Django renders on
+# PostgreSQL as UPPER("content"::text) LIKE UPPER(%s), so the trigram index
+# is built on the same expression
+TRIGRAM_SQL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm;",
+    "CREATE INDEX IF NOT EXISTS idx_post_content_trgm ON posts_post USING gin (UPPER(content::text) gin_trgm_ops);",
+]
+
+
+def add_trigram_index(apps, schema_editor):
+    """Replace the btree content index with a pg_trgm GIN index on PostgreSQL"""
+    schema_editor.execute("DROP INDEX IF EXISTS idx_post_content_search;")
+    if schema_editor.connection.vendor == 'postgresql':
+        for sql in TRIGRAM_SQL:
+            schema_editor.execute(sql)
+
+
+def remove_trigram_index(apps, schema_editor):
+    """Restore the original btree content index"""
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute("DROP INDEX IF EXISTS idx_post_content_trgm;")
+    schema_editor.execute("CREATE INDEX IF NOT EXISTS idx_post_content_search ON posts_post(content);")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0003_post_visibility_author_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_trigram_index, remove_trigram_index),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.6 on 2026-10-15 22:46
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_interaction_counts(apps, schema_editor):
+    """Populate the counters from existing likes and comments"""
+    Post = apps.get_model('posts', 'Post')
+    Like = apps.get_model('posts', 'Like')
+    Comment = apps.get_model('posts', 'Comment')
+
+    def count_of(model):
+        return Coalesce(Subquery(
+            model.objects.filter(post=OuterRef('pk')).values('post').annotate(total=Count('id')).values('total')[:1]
+        ), 0)
+
+    Post.objects.update(
+        likes_count=count_of(Like),
+        comments_count=count_of(Comment),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0004_post_content_trigram_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='comments_count',
+            field=models.PositiveIntegerField(default=0, help_text='Number of comments on this post, including replies'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='likes_count',
+            field=models.PositiveIntegerField(default=0, help_text='Number of likes on this post'),
+        ),
+        migrations.RunPython(backfill_interaction_counts, migrations.RunPython.noop),
+    ]
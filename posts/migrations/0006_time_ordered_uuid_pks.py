@@ -0,0 +1,34 @@
+# Generated by Django 5.2.6 on 2026-10-15 22:48
+
+import posts.utils
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0005_post_interaction_counts'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='comment',
+            name='id',
+            field=models.UUIDField(default=posts.utils.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='like',
+            name='id',
+            field=models.UUIDField(default=posts.utils.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='post',
+            name='id',
+            field=models.UUIDField(default=posts.utils.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='postshare',
+            name='id',
+            field=models.UUIDField(default=posts.utils.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
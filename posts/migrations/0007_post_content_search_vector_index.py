@@ -0,0 +1,33 @@
+# Generated manually for search optimization
+
+from django.db import migrations
+
+
+# Matches the expression SearchVector('content', config='english') compiles
+# to, so post_search's full-text filter can use the index
+SEARCH_VECTOR_INDEX_SQL = (
+    "CREATE INDEX IF NOT EXISTS idx_post_content_tsv ON posts_post "
+    "USING gin (to_tsvector('english'::regconfig, COALESCE(content, '')));"
+)
+
+
+def add_search_vector_index(apps, schema_editor):
+    """Add a full-text GIN index on post content on PostgreSQL"""
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(SEARCH_VECTOR_INDEX_SQL)
+
+
+def remove_search_vector_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute("DROP INDEX IF EXISTS idx_post_content_tsv;")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0006_time_ordered_uuid_pks'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_search_vector_index, remove_search_vector_index),
+    ]
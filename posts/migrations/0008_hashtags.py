@@ -0,0 +1,97 @@
+# Generated by Django 5.2.6 on 2026-10-15 22:53
+
+import django.db.models.deletion
+import posts.utils
+from django.db import migrations, models
+from posts.utils import extract_hashtags
+
+
+def backfill_hashtags(apps, schema_editor):
+    """Populate the hashtag tables from existing post content"""
+    Post = apps.get_model('posts', 'Post')
+    Hashtag = apps.get_model('posts', 'Hashtag')
+    PostHashtag = apps.get_model('posts', 'PostHashtag')
+
+    post_tags = {}
+    for post_id, content in Post.objects.filter(content__contains='#').values_list('id', 'content').iterator():
+        tags = extract_hashtags(content)
+        if tags:
+            post_tags[post_id] = tags
+
+    counts = {}
+    for tags in post_tags.values():
+        for name in tags:
+            counts[name] = counts.get(name, 0) + 1
+    Hashtag.objects.bulk_create(
+        [Hashtag(name=name, usage_count=count) for name, count in counts.items()],
+        batch_size=500
+    )
+
+    hashtag_ids = dict(Hashtag.objects.values_list('name', 'id'))
+    PostHashtag.objects.bulk_create(
+        [
+            PostHashtag(post_id=post_id, hashtag_id=hashtag_ids[name])
+            for post_id, tags in post_tags.items()
+            for name in tags
+        ],
+        batch_size=500
+    )
+
+
+# hashtag_search filters with name__icontains, so index the same
+# UPPER(name::text) expression Django renders on PostgreSQL
+def add_name_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+        schema_editor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_hashtag_name_trgm "
+            "ON posts_hashtag USING gin (UPPER(name::text) gin_trgm_ops);"
+        )
+
+
+def remove_name_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute("DROP INDEX IF EXISTS idx_hashtag_name_trgm;")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0007_post_content_search_vector_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Hashtag',
+            fields=[
+                ('id', models.UUIDField(default=posts.utils.uuid7, editable=False, primary_key=True, serialize=False)),
+                ('name', models.CharField(help_text="Hashtag text without the leading '#', lowercase", max_length=100, unique=True)),
+                ('usage_count', models.PositiveIntegerField(default=0, help_text='Number of posts using this hashtag')),
+            ],
+            options={
+                'verbose_name': 'Hashtag',
+                'verbose_name_plural': 'Hashtags',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='PostHashtag',
+            fields=[
+                ('id', models.UUIDField(default=posts.utils.uuid7, editable=False, primary_key=True, serialize=False)),
+                ('hashtag', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='post_hashtags', to='posts.hashtag')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='post_hashtags', to='posts.post')),
+            ],
+            options={
+                'verbose_name': 'Post Hashtag',
+                'verbose_name_plural': 'Post Hashtags',
+                'unique_together': {('post', 'hashtag')},
+            },
+        ),
+        migrations.AddField(
+            model_name='hashtag',
+            name='posts',
+            field=models.ManyToManyField(blank=True, related_name='hashtags', through='posts.PostHashtag', to='posts.post'),
+        ),
+        migrations.RunPython(backfill_hashtags, migrations.RunPython.noop),
+        migrations.RunPython(add_name_trigram_index, remove_name_trigram_index),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.6 on 2026-10-15 23:24
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0009_post_visibility_university_index'),
+        ('projects', '0012_project_needs_trigram_index'),
+        ('universities', '0002_remove_university_allow_cross_university_collaboration_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='post',
+            name='posts_post_visibil_c4edb4_idx',
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['visibility', '-created_at'], name='posts_post_visibil_5a979a_idx'),
+        ),
+    ]
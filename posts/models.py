@@ -1,8 +1,10 @@
 from django.db import models
+from django.db.models import Q
 from django.contrib.auth.models import User
 from django.core.validators import MinLengthValidator
 from projects.models import Project
-import uuid
+from accounts.models import UserProfile
+from .utils import uuid7
 
 
 class Post(models.Model):
@@ -18,7 +20,7 @@ class Post(models.Model):
     ]
     
     # Core fields
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     author = models.ForeignKey(
         User, 
         on_delete=models.CASCADE, 
@@ -68,6 +70,17 @@ class Post(models.Model):
         help_text="Whether this post has been edited"
     )
     
+    # Denormalized interaction counts, kept current by posts.signals
+    likes_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of likes on this post"
+    )
+    comments_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of comments on this post, including replies"
+    )
+    COUNTER_FIELDS = ('likes_count', 'comments_count')
+    
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -78,13 +91,22 @@ class Post(models.Model):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['author']),
-            models.Index(fields=['visibility']),
+            models.Index(fields=['visibility', '-created_at']),
             models.Index(fields=['created_at']),
+            models.Index(fields=['visibility', 'author']),
+            models.Index(fields=['visibility', 'university', '-created_at']),
         ]
     
     def __str__(self):
-        content_preview = self.content[:50] + "..." if len(self.content) > 50 else self.content
-        return f"{self.author.username}: {content_preview}"
+        return f"{self.author.username}: {self.get_content_preview()}"
+    
+    def get_content_preview(self):
+        """First 50 characters of content, using the admin's Substr annotations when present"""
+        if hasattr(self, '_content_preview'):
+            preview, length = self._content_preview, self._content_length
+        else:
+            preview, length = self.content[:50], len(self.content)
+        return preview + "..." if length > 50 else preview
     
     def get_likes_count(self):
         """Return the number of likes for this post"""
@@ -100,31 +122,58 @@ class Post(models.Model):
             return self.likes.filter(user=user).exists()
         return False
     
+    @staticmethod
+    def visibility_filter(user):
+        """
+        Q matching the posts a user can view; the queryset form of can_view.
+        Built once per user object (and so once per request)
+        """
+        if not hasattr(user, '_post_visibility_q'):
+            if not user.is_authenticated:
+                visible = Q(visibility='public')
+            else:
+                university_id = UserProfile.university_id_for(user)
+                visible = Q(visibility='public') | Q(author=user)
+                if university_id:
+                    visible |= Q(visibility='university', university_id=university_id)
+            user._post_visibility_q = visible
+        return user._post_visibility_q
+    
     def can_view(self, user):
         """Check if a user can view this post based on visibility settings"""
         if self.visibility == 'public':
             return True
         elif self.visibility == 'private':
-            return user == self.author
+            return user.is_authenticated and self.author_id == user.id
         elif self.visibility == 'university':
-            if user.is_authenticated and hasattr(user, 'profile'):
-                return (user == self.author or 
-                       user.profile.university == self.author.profile.university)
+            if user.is_authenticated:
+                if self.author_id == user.id:
+                    return True
+                university_id = UserProfile.university_id_for(user)
+                return university_id is not None and university_id == self.university_id
         return False
     
     def can_edit(self, user):
         """Check if a user can edit this post"""
-        return user == self.author
+        return user.is_authenticated and self.author_id == user.id
     
     def can_delete(self, user):
         """Check if a user can delete this post"""
-        return user == self.author
+        return user.is_authenticated and self.author_id == user.id
 
     
     def save(self, *args, **kwargs):
         """Override save to automatically set university from author's profile"""
-        if self.author and hasattr(self.author, 'profile') and self.author.profile.university:
-            self.university = self.author.profile.university
+        if self.author and hasattr(self.author, 'profile') and self.author.profile.university_id:
+            self.university_id = self.author.profile.university_id
+        # posts.signals moves the counters with F() updates; writing back the
+        # values loaded with this instance would undo concurrent likes and
+        # comments, so ordinary saves of an existing post leave them alone
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COUNTER_FIELDS
+            ]
         super().save(*args, **kwargs)
 
 
@@ -134,7 +183,7 @@ class Comment(models.Model):
     Comment model for post comments
     """
     
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     post = models.ForeignKey(
         Post,
         on_delete=models.CASCADE,
@@ -183,8 +232,15 @@ class Comment(models.Model):
         ]
     
     def __str__(self):
-        content_preview = self.content[:30] + "..." if len(self.content) > 30 else self.content
-        return f"{self.author.username} on {self.post}: {content_preview}"
+        return f"{self.author.username} on {self.post}: {self.get_content_preview()}"
+    
+    def get_content_preview(self):
+        """First 30 characters of content, using the admin's Substr annotations when present"""
+        if hasattr(self, '_content_preview'):
+            preview, length = self._content_preview, self._content_length
+        else:
+            preview, length = self.content[:30], len(self.content)
+        return preview + "..." if length > 30 else preview
     
     def get_replies_count(self):
         """Return the number of replies to this comment"""
@@ -192,11 +248,13 @@ class Comment(models.Model):
     
     def can_edit(self, user):
         """Check if a user can edit this comment"""
-        return user == self.author
+        return user.is_authenticated and self.author_id == user.id
     
     def can_delete(self, user):
         """Check if a user can delete this comment"""
-        return user == self.author or user == self.post.author
+        return user.is_authenticated and (
+            self.author_id == user.id or self.post.author_id == user.id
+        )
 
 
 class Like(models.Model):
@@ -204,7 +262,7 @@ class Like(models.Model):
     Like model for post likes
     """
     
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     post = models.ForeignKey(
         Post,
         on_delete=models.CASCADE,
@@ -238,7 +296,7 @@ class PostShare(models.Model):
     Model to track post shares
     """
     
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     post = models.ForeignKey(
         Post,
         on_delete=models.CASCADE,
@@ -263,4 +321,60 @@ class PostShare(models.Model):
         ]
     
     def __str__(self):
-        return f"{self.user.username} shared {self.post}"
\ No newline at end of file
+        return f"{self.user.username} shared {self.post}"
+
+class Hashtag(models.Model):
+    """
+    Hashtag used in post content, stored lowercase; maintained by posts.signals
+    """
+    
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
+    name = models.CharField(
+        max_length=100,
+        unique=True,
+        help_text="Hashtag text without the leading '#', lowercase"
+    )
+    usage_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of posts using this hashtag"
+    )
+    posts = models.ManyToManyField(
+        Post,
+        through='PostHashtag',
+        related_name='hashtags',
+        blank=True
+    )
+    
+    class Meta:
+        verbose_name = "Hashtag"
+        verbose_name_plural = "Hashtags"
+        ordering = ['name']
+    
+    def __str__(self):
+        return f"#{self.name}"
+
+
+class PostHashtag(models.Model):
+    """
+    Link between a post and a hashtag in its content
+    """
+    
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='post_hashtags'
+    )
+    hashtag = models.ForeignKey(
+        Hashtag,
+        on_delete=models.CASCADE,
+        related_name='post_hashtags'
+    )
+    
+    class Meta:
+        verbose_name = "Post Hashtag"
+        verbose_name_plural = "Post Hashtags"
+        unique_together = ('post', 'hashtag')
+    
+    def __str__(self):
+        return f"{self.post_id} #{self.hashtag.name}"
@@ -1,15 +1,29 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
 from django.db import models
+from collections import defaultdict
 from .models import Post, Comment, Like, PostShare
 from projects.models import Project
 
 
+def absolute_media_url(request, file):
+    """
+    request.build_absolute_uri(file.url), memoized on the request by storage
+    path so repeated authors and images are only resolved once per response
+    """
+    url_cache = getattr(request, '_media_url_cache', None)
+    if url_cache is None:
+        url_cache = request._media_url_cache = {}
+    if file.name not in url_cache:
+        url_cache[file.name] = request.build_absolute_uri(file.url)
+    return url_cache[file.name]
+
+
 class AuthorSerializer(serializers.ModelSerializer):
     """
     Simplified user serializer for post authors
     """
-    full_name = serializers.CharField(source='profile.get_full_name', read_only=True)
+    full_name = serializers.CharField(source='profile.full_name', read_only=True)
     profile_picture = serializers.SerializerMethodField()
     user_role = serializers.CharField(source='profile.user_role', read_only=True)
     university_name = serializers.SerializerMethodField()
@@ -20,18 +34,42 @@ class AuthorSerializer(serializers.ModelSerializer):
         fields = ['id', 'username', 'full_name', 'profile_picture', 'user_role', 'university_name', 'university_id']
     
     def get_profile_picture(self, obj):
-        if hasattr(obj, 'profile') and obj.profile.profile_picture:
+        # getattr resolves the profile once (None when the user has none)
+        profile = getattr(obj, 'profile', None)
+        if profile is not None and profile.profile_picture:
             request = self.context.get('request')
             if request:
-                return request.build_absolute_uri(obj.profile.profile_picture.url)
+                return absolute_media_url(request, profile.profile_picture)
         return None
     
     def get_university_name(self, obj):
-        if hasattr(obj, 'profile') and obj.profile.university:
-            return obj.profile.university.name
+        profile = getattr(obj, 'profile', None)
+        if profile is not None and profile.university_id is not None:
+            return profile.university.name
         return None
 
 
+class AnnotatedPermissionField(serializers.BooleanField):
+    """
+    Read-only flag read straight from a queryset annotation (see
+    posts.views.annotate_viewer_fields); un-annotated posts fall back to
+    calling the named model check with the request user
+    """
+    
+    def __init__(self, check, **kwargs):
+        self.check = check
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+    
+    def get_attribute(self, instance):
+        if hasattr(instance, self.source):
+            return getattr(instance, self.source)
+        request = self.context.get('request')
+        if request and request.user.is_authenticated:
+            return getattr(instance, self.check)(request.user)
+        return False
+
+
 class ProjectTagSerializer(serializers.ModelSerializer):
     """
     Simplified project serializer for tagged projects in posts
@@ -62,12 +100,23 @@ class CommentSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'author', 'is_edited', 'created_at', 'updated_at']
     
     def get_replies(self, obj):
-        if obj.parent is None:  # Only get replies for top-level comments
-            replies = obj.replies.all().order_by('created_at')  # Sort replies by creation time
+        if self.context.get('flat_comments'):
+            return []  # serialize_comment_threads attaches replies afterwards
+        if obj.parent_id is None:  # Only get replies for top-level comments
+            # Comment.Meta orders by created_at; all() keeps any prefetched replies
+            replies = obj.replies.all()
             return CommentSerializer(replies, many=True, context=self.context).data
         return []  # Always return an empty array for reply comments
     
     def get_replies_count(self, obj):
+        if self.context.get('flat_comments'):
+            return 0  # serialize_comment_threads fills in the real count
+        # Replies loaded by comment_thread_queryset carry a Count annotation
+        if hasattr(obj, 'replies_total'):
+            return obj.replies_total
+        # Top-level comments have prefetched replies; count them in memory
+        if 'replies' in getattr(obj, '_prefetched_objects_cache', {}):
+            return len(obj.replies.all())
         return obj.get_replies_count()
     
     def get_can_edit(self, obj):
@@ -83,6 +132,66 @@ class CommentSerializer(serializers.ModelSerializer):
         return False
 
 
+def serialize_comment_threads(comments, context):
+    """
+    Serialize a post's comments as top-level threads with nested replies.
+    All comments go through one CommentSerializer pass and are then grouped
+    by parent, instead of building a nested serializer per comment.
+    `comments` must be ordered by created_at.
+    """
+    rows = CommentSerializer(comments, many=True, context={**context, 'flat_comments': True}).data
+    
+    by_parent = defaultdict(list)
+    for row in rows:
+        parent_id = row['parent']
+        by_parent[str(parent_id) if parent_id is not None else None].append(row)
+    
+    for row in rows:
+        row['replies_count'] = len(by_parent.get(row['id'], []))
+    
+    top_level = by_parent.get(None, [])
+    for row in top_level:
+        row['replies'] = by_parent.get(row['id'], [])
+    return top_level
+
+
+
+def taggable_projects(user, project_ids):
+    """
+    Projects among project_ids that user may tag: public ones or ones they
+    own or belong to. Team membership is an EXISTS on the through table, so
+    no join and DISTINCT are needed
+    """
+    TeamMembership = Project.team_members.through
+    return Project.objects.filter(id__in=project_ids).filter(
+        models.Q(visibility='public') |
+        models.Q(owner=user) |
+        models.Exists(TeamMembership.objects.filter(project_id=models.OuterRef('pk'), user_id=user.id))
+    )
+
+
+def sync_tagged_projects(post, project_ids):
+    """
+    Point post.tagged_projects at project_ids by diffing the through table,
+    inserting and deleting only the rows that change instead of set()'s
+    row-by-row rewrite
+    """
+    Through = Post.tagged_projects.through
+    existing = set(Through.objects.filter(post_id=post.pk).values_list('project_id', flat=True))
+    wanted = set(project_ids)
+    
+    Through.objects.bulk_create(
+        [Through(post_id=post.pk, project_id=project_id) for project_id in wanted - existing],
+        ignore_conflicts=True,
+        batch_size=500
+    )
+    stale = existing - wanted
+    if stale:
+        Through.objects.filter(post_id=post.pk, project_id__in=stale).delete()
+    
+    # Drop any prefetched tags so the response reflects the new set
+    getattr(post, '_prefetched_objects_cache', {}).pop('tagged_projects', None)
+
 class PostSerializer(serializers.ModelSerializer):
     """
     Main post serializer with all related data
@@ -97,16 +206,16 @@ class PostSerializer(serializers.ModelSerializer):
     )
     
     # Interaction counts and status
-    likes_count = serializers.SerializerMethodField()
-    comments_count = serializers.SerializerMethodField()
+    likes_count = serializers.IntegerField(read_only=True)
+    comments_count = serializers.IntegerField(read_only=True)
     is_liked = serializers.SerializerMethodField()
     
     # Comments (for detailed view) - only top-level comments with nested replies
     comments = serializers.SerializerMethodField()
     
     # Permissions
-    can_edit = serializers.SerializerMethodField()
-    can_delete = serializers.SerializerMethodField()
+    can_edit = AnnotatedPermissionField('can_edit', source='can_edit_ann')
+    can_delete = AnnotatedPermissionField('can_delete', source='can_delete_ann')
     
     # Image URL
     image_url = serializers.SerializerMethodField()
@@ -121,40 +230,28 @@ class PostSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'author', 'is_edited', 'created_at', 'updated_at']
     
-    def get_likes_count(self, obj):
-        return obj.get_likes_count()
-    
-    def get_comments_count(self, obj):
-        return obj.get_comments_count()
-    
     def get_comments(self, obj):
         """Get only top-level comments with their nested replies"""
-        top_level_comments = obj.comments.filter(parent__isnull=True).order_by('created_at')
-        return CommentSerializer(top_level_comments, many=True, context=self.context).data
+        # Use the Prefetch from PostViewSet when available
+        comments = getattr(obj, 'all_comments', None)
+        if comments is None:
+            comments = obj.comments.select_related('author__profile__university').order_by('created_at')
+        return serialize_comment_threads(comments, self.context)
     
     def get_is_liked(self, obj):
+        # Use the Exists() annotation from the view when available
+        if hasattr(obj, 'is_liked_ann'):
+            return obj.is_liked_ann
         request = self.context.get('request')
         if request and request.user.is_authenticated:
             return obj.is_liked_by(request.user)
         return False
     
-    def get_can_edit(self, obj):
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return obj.can_edit(request.user)
-        return False
-    
-    def get_can_delete(self, obj):
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return obj.can_delete(request.user)
-        return False
-    
     def get_image_url(self, obj):
         if obj.image:
             request = self.context.get('request')
             if request:
-                return request.build_absolute_uri(obj.image.url)
+                return absolute_media_url(request, obj.image)
         return None
     
     def create(self, validated_data):
@@ -168,15 +265,7 @@ class PostSerializer(serializers.ModelSerializer):
         if tagged_project_ids:
             # Filter projects that the user can tag (public projects or projects they're part of)
             user = self.context['request'].user
-            accessible_projects = Project.objects.filter(
-                id__in=tagged_project_ids
-            ).filter(
-                models.Q(visibility='public') |
-                models.Q(owner=user) |
-                models.Q(team_members=user)
-            ).distinct()
-            
-            post.tagged_projects.set(accessible_projects)
+            sync_tagged_projects(post, taggable_projects(user, tagged_project_ids).values_list('id', flat=True))
         
         return post
     
@@ -196,15 +285,7 @@ class PostSerializer(serializers.ModelSerializer):
         # Update tagged projects if provided
         if tagged_project_ids is not None:
             user = self.context['request'].user
-            accessible_projects = Project.objects.filter(
-                id__in=tagged_project_ids
-            ).filter(
-                models.Q(visibility='public') |
-                models.Q(owner=user) |
-                models.Q(team_members=user)
-            ).distinct()
-            
-            instance.tagged_projects.set(accessible_projects)
+            sync_tagged_projects(instance, taggable_projects(user, tagged_project_ids).values_list('id', flat=True))
         
         return instance
 
@@ -217,13 +298,13 @@ class PostListSerializer(serializers.ModelSerializer):
     tagged_projects = ProjectTagSerializer(many=True, read_only=True)
     
     # Interaction counts and status
-    likes_count = serializers.SerializerMethodField()
-    comments_count = serializers.SerializerMethodField()
+    likes_count = serializers.IntegerField(read_only=True)
+    comments_count = serializers.IntegerField(read_only=True)
     is_liked = serializers.SerializerMethodField()
     
     # Permissions
-    can_edit = serializers.SerializerMethodField()
-    can_delete = serializers.SerializerMethodField()
+    can_edit = AnnotatedPermissionField('can_edit', source='can_edit_ann')
+    can_delete = AnnotatedPermissionField('can_delete', source='can_delete_ann')
     
     # Image URL
     image_url = serializers.SerializerMethodField()
@@ -236,35 +317,20 @@ class PostListSerializer(serializers.ModelSerializer):
             'is_liked', 'can_edit', 'can_delete', 'created_at', 'updated_at'
         ]
     
-    def get_likes_count(self, obj):
-        return obj.get_likes_count()
-    
-    def get_comments_count(self, obj):
-        return obj.get_comments_count()
-    
     def get_is_liked(self, obj):
+        # Use the Exists() annotation from the view when available
+        if hasattr(obj, 'is_liked_ann'):
+            return obj.is_liked_ann
         request = self.context.get('request')
         if request and request.user.is_authenticated:
             return obj.is_liked_by(request.user)
         return False
     
-    def get_can_edit(self, obj):
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return obj.can_edit(request.user)
-        return False
-    
-    def get_can_delete(self, obj):
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return obj.can_delete(request.user)
-        return False
-    
     def get_image_url(self, obj):
         if obj.image:
             request = self.context.get('request')
             if request:
-                return request.build_absolute_uri(obj.image.url)
+                return absolute_media_url(request, obj.image)
         return None
 
 
@@ -279,23 +345,12 @@ class CommentCreateSerializer(serializers.ModelSerializer):
     
     def validate_parent(self, value):
         """Ensure parent comment belongs to the same post"""
-        if value:
-            post_id = self.context.get('post_id')
-            if post_id:
-                # Convert post_id to UUID if it's a string
-                import uuid
-                if isinstance(post_id, str):
-                    try:
-                        post_id = uuid.UUID(post_id)
-                    except ValueError:
-                        raise serializers.ValidationError(
-                            "Invalid post ID format"
-                        )
-                
-                if value.post.id != post_id:
-                    raise serializers.ValidationError(
-                        "Parent comment must belong to the same post"
-                    )
+        # post_id comes from the <uuid:post_pk> URL kwarg, already a UUID;
+        # compare the FK column rather than loading value.post
+        if value and value.post_id != self.context.get('post_id'):
+            raise serializers.ValidationError(
+                "Parent comment must belong to the same post"
+            )
         return value
 
 
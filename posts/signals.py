@@ -0,0 +1,84 @@
+"""
+Signal handlers for posts app
+Keep the denormalized Post.likes_count/comments_count and the hashtag
+tables in step with the rows
+"""
+from django.db.models import F, QuerySet
+from django.db.models.signals import post_save, post_delete, pre_delete
+from django.dispatch import receiver
+from .models import Post, Comment, Like, Hashtag, PostHashtag
+from .utils import extract_hashtags
+
+
+def deleting_posts(origin):
+    """
+    Whether a delete was started on posts (an instance or a queryset), in
+    which case the likes and comments it cascades to go with their post
+    and its counters don't need updating
+    """
+    if isinstance(origin, QuerySet):
+        return origin.model is Post
+    return isinstance(origin, Post)
+
+
+@receiver(post_save, sender=Like)
+def increment_likes_count(sender, instance, created, **kwargs):
+    if created:
+        Post.objects.filter(pk=instance.post_id).update(likes_count=F('likes_count') + 1)
+
+
+@receiver(post_delete, sender=Like)
+def decrement_likes_count(sender, instance, origin=None, **kwargs):
+    if deleting_posts(origin):
+        return
+    Post.objects.filter(pk=instance.post_id, likes_count__gt=0).update(likes_count=F('likes_count') - 1)
+
+
+@receiver(post_save, sender=Comment)
+def increment_comments_count(sender, instance, created, **kwargs):
+    if created:
+        Post.objects.filter(pk=instance.post_id).update(comments_count=F('comments_count') + 1)
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comments_count(sender, instance, origin=None, **kwargs):
+    if deleting_posts(origin):
+        return
+    Post.objects.filter(pk=instance.post_id, comments_count__gt=0).update(comments_count=F('comments_count') - 1)
+
+
+def sync_post_hashtags(post):
+    """Make the post's PostHashtag rows match the hashtags in its content"""
+    tags = extract_hashtags(post.content)
+    current = dict(
+        PostHashtag.objects.filter(post=post).values_list('hashtag__name', 'hashtag_id')
+    )
+    
+    stale_ids = [hashtag_id for name, hashtag_id in current.items() if name not in tags]
+    if stale_ids:
+        PostHashtag.objects.filter(post=post, hashtag_id__in=stale_ids).delete()
+        Hashtag.objects.filter(id__in=stale_ids, usage_count__gt=0).update(usage_count=F('usage_count') - 1)
+    
+    new_tags = tags - current.keys()
+    if new_tags:
+        Hashtag.objects.bulk_create([Hashtag(name=name) for name in new_tags], ignore_conflicts=True)
+        new_ids = list(Hashtag.objects.filter(name__in=new_tags).values_list('id', flat=True))
+        PostHashtag.objects.bulk_create(
+            [PostHashtag(post=post, hashtag_id=hashtag_id) for hashtag_id in new_ids],
+            ignore_conflicts=True
+        )
+        Hashtag.objects.filter(id__in=new_ids).update(usage_count=F('usage_count') + 1)
+
+
+@receiver(post_save, sender=Post)
+def update_post_hashtags(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields is not None and 'content' not in update_fields:
+        return
+    if created and '#' not in instance.content:
+        return
+    sync_post_hashtags(instance)
+
+
+@receiver(pre_delete, sender=Post)
+def release_post_hashtags(sender, instance, **kwargs):
+    Hashtag.objects.filter(post_hashtags__post=instance, usage_count__gt=0).update(usage_count=F('usage_count') - 1)
@@ -0,0 +1,31 @@
+import os
+import re
+import time
+import uuid
+
+
+def uuid7():
+    """
+    Time-ordered UUID (RFC 9562 version 7): a 48-bit Unix millisecond
+    timestamp followed by random bits, so new primary keys land at the end
+    of the index instead of at random pages
+    """
+    unix_ms = time.time_ns() // 1_000_000
+    value = (unix_ms & 0xFFFF_FFFF_FFFF) << 80 | int.from_bytes(os.urandom(10), 'big')
+    
+    # Set the version (7) and RFC 4122 variant bits
+    value &= ~(0xF000 << 64)
+    value |= 7 << 76
+    value &= ~(0xC000 << 48)
+    value |= 0x8000 << 48
+    return uuid.UUID(int=value)
+
+
+HASHTAG_RE = re.compile(r'#(\w+)')
+
+
+def extract_hashtags(content):
+    """Distinct lowercase hashtags (without '#') found in content"""
+    if '#' not in content:
+        return set()
+    return {match.group(1).lower()[:100] for match in HASHTAG_RE.finditer(content)}
@@ -1,17 +1,116 @@
 from rest_framework import viewsets, status, permissions, filters
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
+from rest_framework.pagination import PageNumberPagination
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q, Count
+from django.db.models import Q, F, Count, Exists, OuterRef, Value, BooleanField, ExpressionWrapper, Prefetch
 from django.shortcuts import get_object_or_404
-import re
-from .models import Post, Comment, Like, PostShare
+from django.contrib.auth.models import User
+from django.db import connection, IntegrityError, transaction
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from .models import Post, Comment, Like, PostShare, Hashtag, PostHashtag
+from projects.models import Project
 from .serializers import (
     PostSerializer, PostListSerializer, CommentSerializer, 
     CommentCreateSerializer, LikeSerializer
 )
 
 
+# Columns read by the post serializers and AuthorSerializer
+POST_READ_FIELDS = (
+    'id', 'content', 'image', 'visibility', 'is_edited', 'likes_count', 'comments_count',
+    'created_at', 'updated_at',
+    'author__id', 'author__username',
+    'author__profile__first_name', 'author__profile__last_name',
+    'author__profile__profile_picture', 'author__profile__user_role',
+    'author__profile__university__id', 'author__profile__university__name',
+)
+# Columns read by ProjectTagSerializer
+TAGGED_PROJECT_FIELDS = ('id', 'title', 'project_type', 'status')
+
+
+def tagged_projects_prefetch():
+    """Tagged projects narrowed to the columns ProjectTagSerializer renders"""
+    return Prefetch('tagged_projects', queryset=Project.objects.only(*TAGGED_PROJECT_FIELDS))
+
+
+def tagged_project_match(search_query, fields):
+    """
+    EXISTS over the post's tagged projects matching search_query in any of
+    fields; unlike joining tagged_projects it can't duplicate posts, so the
+    search needs no DISTINCT
+    """
+    matches = Q()
+    for field in fields:
+        matches |= Q(**{f'project__{field}__icontains': search_query})
+    return Exists(Post.tagged_projects.through.objects.filter(matches, post_id=OuterRef('pk')))
+
+
+def visible_hashtag_names(visibility, search_query, limit=20):
+    """
+    Hashtag names containing search_query that are used by at least one
+    post matching visibility (a Post.visibility_filter Q), looked up in the
+    hashtag table
+    """
+    visible_posts = Post.objects.filter(visibility)
+    return list(
+        Hashtag.objects.filter(name__icontains=search_query).filter(
+            Exists(PostHashtag.objects.filter(hashtag=OuterRef('pk'), post__in=visible_posts))
+        ).order_by('name').values_list('name', flat=True)[:limit]
+    )
+
+
+def annotate_viewer_fields(queryset, user):
+    """
+    Annotate is_liked_ann, can_edit_ann and can_delete_ann for the viewing
+    user in SQL instead of checking each post in Python
+    """
+    if user.is_authenticated:
+        is_author = ExpressionWrapper(Q(author=user), output_field=BooleanField())
+        return queryset.annotate(
+            is_liked_ann=Exists(Like.objects.filter(post=OuterRef('pk'), user=user)),
+            can_edit_ann=is_author,
+            can_delete_ann=is_author
+        )
+    false = Value(False, output_field=BooleanField())
+    return queryset.annotate(is_liked_ann=false, can_edit_ann=false, can_delete_ann=false)
+
+
+def comment_thread_queryset():
+    """
+    Top-level comments with authors and replies loaded up front, matching
+    what CommentSerializer renders
+    """
+    return Comment.objects.filter(parent__isnull=True).select_related(
+        'author__profile__university'
+    ).prefetch_related(
+        Prefetch(
+            'replies',
+            queryset=Comment.objects.select_related('author__profile__university').annotate(
+                replies_total=Count('replies')
+            ).order_by('created_at')
+        )
+    ).order_by('created_at')
+
+
+def comments_prefetch():
+    """
+    Every comment on each post, with authors, in created order as
+    all_comments; PostSerializer.get_comments threads them in Python
+    """
+    return Prefetch(
+        'comments',
+        queryset=Comment.objects.select_related('author__profile__university').order_by('created_at'),
+        to_attr='all_comments'
+    )
+
+
+class LikePagination(PageNumberPagination):
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+
 class PostViewSet(viewsets.ModelViewSet):
     """
     ViewSet for managing posts with CRUD operations
@@ -20,43 +119,40 @@ class PostViewSet(viewsets.ModelViewSet):
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['visibility', 'author__profile__user_role']
     search_fields = ['content', 'author__username', 'author__profile__first_name', 'author__profile__last_name']
-    ordering_fields = ['created_at', 'updated_at', 'likes_count']
+    ordering_fields = ['created_at', 'updated_at', 'likes_count', 'comments_count']
     ordering = ['-created_at']
     
     def get_queryset(self):
         """
         Get posts that the user can view based on visibility settings
+        Annotates the viewer fields, which the post serializers read instead
+        of querying per row
         """
         user = self.request.user
-        queryset = Post.objects.select_related('author', 'author__profile').prefetch_related(
-            'tagged_projects', 'likes', 
-            'comments__author', 'comments__author__profile',
-            'comments__replies__author', 'comments__replies__author__profile'
-        ).annotate(
-            likes_count=Count('likes', distinct=True),
-            comments_count=Count('comments', distinct=True)
+        queryset = Post.objects.select_related('author__profile__university').prefetch_related(
+            tagged_projects_prefetch()
         )
         
-        if user.is_authenticated:
-            # Show public posts, user's own posts, and university posts if same university
-            user_university = getattr(user.profile, 'university', None) if hasattr(user, 'profile') else None
-            
-            queryset = queryset.filter(
-                Q(visibility='public') |
-                Q(author=user) |
-                (Q(visibility='university') & Q(author__profile__university=user_university) if user_university else Q(pk=None))
-            )
-        else:
-            # Only show public posts for unauthenticated users
-            queryset = queryset.filter(visibility='public')
+        # Narrow reads to the columns the serializers use; writes keep full rows
+        if self.request.method in permissions.SAFE_METHODS:
+            queryset = queryset.only(*POST_READ_FIELDS)
         
-        return queryset.distinct()
+        # Only detail responses render comment threads; the like, likes and
+        # share actions just need the post row
+        if self.action in ('retrieve', 'update', 'partial_update'):
+            queryset = queryset.prefetch_related(comments_prefetch())
+        
+        # Public posts, the user's own posts, and university posts if same university
+        queryset = queryset.filter(Post.visibility_filter(user))
+        
+        return annotate_viewer_fields(queryset, user)
     
     def get_serializer_class(self):
         """
         Use different serializers for list vs detail views
+        Collection endpoints don't render comment threads
         """
-        if self.action == 'list':
+        if self.action in ('list', 'feed', 'my_posts'):
             return PostListSerializer
         return PostSerializer
     
@@ -71,7 +167,7 @@ class PostViewSet(viewsets.ModelViewSet):
         Only allow authors to update their own posts
         """
         post = self.get_object()
-        if post.author != self.request.user:
+        if post.author_id != self.request.user.id:
             return Response(
                 {'error': 'You can only edit your own posts'},
                 status=status.HTTP_403_FORBIDDEN
@@ -82,7 +178,7 @@ class PostViewSet(viewsets.ModelViewSet):
         """
         Only allow authors to delete their own posts
         """
-        if instance.author != self.request.user:
+        if instance.author_id != self.request.user.id:
             return Response(
                 {'error': 'You can only delete your own posts'},
                 status=status.HTTP_403_FORBIDDEN
@@ -104,19 +200,33 @@ class PostViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        like, created = Like.objects.get_or_create(post=post, user=user)
-        
-        if created:
+        # Toggle: unliking is a single delete, liking a single insert
+        deleted, _ = Like.objects.filter(post=post, user=user).delete()
+        if deleted:
+            # The like signals moved the counter column down by one; apply the
+            # same step to the row already loaded instead of reading it back
+            post.likes_count = max(post.likes_count - 1, 0)
             return Response(
-                {'message': 'Post liked', 'liked': True, 'likes_count': post.get_likes_count()},
-                status=status.HTTP_201_CREATED
+                {'message': 'Post unliked', 'liked': False, 'likes_count': post.likes_count},
+                status=status.HTTP_200_OK
             )
-        else:
-            like.delete()
+        
+        try:
+            with transaction.atomic():
+                Like.objects.create(post=post, user=user)
+        except IntegrityError:
+            # A concurrent request liked it first; its signal already counted
+            # the like, so the loaded count stays as it is
             return Response(
-                {'message': 'Post unliked', 'liked': False, 'likes_count': post.get_likes_count()},
+                {'message': 'Post already liked', 'liked': True, 'likes_count': post.likes_count},
                 status=status.HTTP_200_OK
             )
+        
+        post.likes_count += 1
+        return Response(
+            {'message': 'Post liked', 'liked': True, 'likes_count': post.likes_count},
+            status=status.HTTP_201_CREATED
+        )
     
     @action(detail=True, methods=['get'], permission_classes=[permissions.IsAuthenticatedOrReadOnly])
     def likes(self, request, pk=None):
@@ -133,9 +243,13 @@ class PostViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        likes = post.likes.select_related('user', 'user__profile').all()
-        serializer = LikeSerializer(likes, many=True, context={'request': request})
-        return Response(serializer.data)
+        likes = post.likes.select_related('user__profile__university')
+        
+        # Page the likes so a popular post doesn't serialize every row
+        paginator = LikePagination()
+        page = paginator.paginate_queryset(likes, request, view=self)
+        serializer = LikeSerializer(page, many=True, context={'request': request})
+        return paginator.get_paginated_response(serializer.data)
     
     @action(detail=True, methods=['post'], permission_classes=[permissions.IsAuthenticated])
     def share(self, request, pk=None):
@@ -152,8 +266,8 @@ class PostViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        # Create share record
-        PostShare.objects.create(post=post, user=user)
+        # Create share record; a single INSERT by id, with no post reload
+        PostShare.objects.create(post_id=post.id, user=user)
         
         # Generate share URL
         share_url = request.build_absolute_uri(f'/posts/{post.id}/')
@@ -168,38 +282,23 @@ class PostViewSet(viewsets.ModelViewSet):
         """
         Get personalized feed for authenticated user
         """
-        user = request.user
-        user_university = getattr(user.profile, 'university', None) if hasattr(user, 'profile') else None
-        
-        # Get posts from followed users, same university, and public posts
-        queryset = self.get_queryset().filter(
-            Q(visibility='public') |
-            Q(author=user) |
-            (Q(visibility='university') & Q(author__profile__university=user_university) if user_university else Q(pk=None))
-        ).distinct()
-        
-        # Apply filtering and pagination
-        queryset = self.filter_queryset(queryset)
-        page = self.paginate_queryset(queryset)
-        
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
-        
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        # get_queryset already limits to public, own and same-university posts,
+        # so the feed is the list endpoint restricted to signed-in users
+        return self.list(request)
     
     @action(detail=False, methods=['get'], permission_classes=[permissions.IsAuthenticated])
     def my_posts(self, request):
         """
         Get current user's posts
         """
-        queryset = Post.objects.filter(author=request.user).select_related(
-            'author', 'author__profile'
-        ).prefetch_related('tagged_projects', 'likes', 'comments').annotate(
-            likes_count=Count('likes', distinct=True),
-            comments_count=Count('comments', distinct=True)
-        ).order_by('-created_at')
+        # Every post has the same author: load it once and let the related
+        # manager attach it to each post instead of joining it per row
+        author = User.objects.select_related('profile__university').get(pk=request.user.pk)
+        post_fields = [field for field in POST_READ_FIELDS if not field.startswith('author__')]
+        queryset = author.posts.prefetch_related(
+            tagged_projects_prefetch()
+        ).only('author', *post_fields).order_by('-created_at')
+        queryset = annotate_viewer_fields(queryset, request.user)
         
         page = self.paginate_queryset(queryset)
         if page is not None:
@@ -223,12 +322,8 @@ class CommentViewSet(viewsets.ModelViewSet):
         """
         post_id = self.kwargs.get('post_pk')
         if post_id:
-            return Comment.objects.filter(
-                post_id=post_id,
-                parent__isnull=True  # Only get top-level comments
-            ).select_related('author', 'author__profile').prefetch_related(
-                'replies__author', 'replies__author__profile'
-            ).order_by('created_at')
+            # Only get top-level comments
+            return comment_thread_queryset().filter(post_id=post_id)
         return Comment.objects.none()
     
     def get_serializer_class(self):
@@ -273,7 +368,7 @@ class CommentViewSet(viewsets.ModelViewSet):
         Only allow authors to update their own comments
         """
         comment = self.get_object()
-        if comment.author != self.request.user:
+        if comment.author_id != self.request.user.id:
             return Response(
                 {'error': 'You can only edit your own comments'},
                 status=status.HTTP_403_FORBIDDEN
@@ -303,6 +398,7 @@ class LikeViewSet(viewsets.ReadOnlyModelViewSet):
     """
     serializer_class = LikeSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    pagination_class = LikePagination
     
     def get_queryset(self):
         """
@@ -312,7 +408,7 @@ class LikeViewSet(viewsets.ReadOnlyModelViewSet):
         if post_id:
             return Like.objects.filter(
                 post_id=post_id
-            ).select_related('user', 'user__profile')
+            ).select_related('user__profile__university')
         return Like.objects.none()
 
 
@@ -333,45 +429,45 @@ def post_search(request):
     user = request.user
     
     # Base queryset with proper permissions
-    queryset = Post.objects.select_related('author', 'author__profile').prefetch_related(
-        'tagged_projects', 'likes', 'comments'
-    ).annotate(
-        likes_count=Count('likes', distinct=True),
-        comments_count=Count('comments', distinct=True)
-    )
+    queryset = Post.objects.select_related('author__profile__university').prefetch_related(
+        tagged_projects_prefetch()
+    ).only(*POST_READ_FIELDS)
     
     # Apply visibility filtering
-    if user.is_authenticated:
-        user_university = getattr(user.profile, 'university', None) if hasattr(user, 'profile') else None
-        
-        queryset = queryset.filter(
-            Q(visibility='public') |
-            Q(author=user) |
-            (Q(visibility='university') & Q(author__profile__university=user_university) if user_university else Q(pk=None))
-        )
-    else:
-        queryset = queryset.filter(visibility='public')
+    queryset = queryset.filter(Post.visibility_filter(user))
     
     # Search functionality
     search_filters = Q()
     
+    ordering = ['-created_at']
+    
     # Check if it's a hashtag search
     if search_query.startswith('#'):
-        hashtag = search_query[1:]
-        search_filters |= Q(content__icontains=f'#{hashtag}')
+        # Exact match through the hashtag table; names are stored lowercase,
+        # so a plain equality uses the unique index on Hashtag.name
+        hashtag = search_query[1:].lower()
+        search_filters |= Q(id__in=PostHashtag.objects.filter(hashtag__name=hashtag).values('post_id'))
     else:
         # General search across content, author info, and tagged projects
+        if connection.vendor == 'postgresql':
+            # Ranked full-text match on content, served by idx_post_content_tsv
+            vector = SearchVector('content', config='english')
+            ts_query = SearchQuery(search_query, config='english', search_type='websearch')
+            queryset = queryset.annotate(search=vector, rank=SearchRank(vector, ts_query))
+            search_filters |= Q(search=ts_query)
+            ordering = ['-rank', '-created_at']
+        else:
+            search_filters |= Q(content__icontains=search_query)
+        
         search_filters |= (
-            Q(content__icontains=search_query) |
             Q(author__username__icontains=search_query) |
             Q(author__profile__first_name__icontains=search_query) |
             Q(author__profile__last_name__icontains=search_query) |
-            Q(tagged_projects__title__icontains=search_query) |
-            Q(tagged_projects__categories__icontains=search_query) |
-            Q(tagged_projects__tags__icontains=search_query)
+            tagged_project_match(search_query, ['title', 'categories', 'tags'])
         )
     
-    queryset = queryset.filter(search_filters).distinct().order_by('-created_at')[:50]  # Limit to 50 results
+    queryset = annotate_viewer_fields(queryset, user)
+    queryset = queryset.filter(search_filters).order_by(*ordering)[:50]  # Limit to 50 results
     
     serializer = PostListSerializer(queryset, many=True, context={'request': request})
     return Response(
@@ -396,31 +492,7 @@ def hashtag_search(request):
     
     user = request.user
     
-    # Base queryset with proper permissions
-    queryset = Post.objects.select_related('author', 'author__profile')
-    
-    # Apply visibility filtering
-    if user.is_authenticated:
-        user_university = getattr(user.profile, 'university', None) if hasattr(user, 'profile') else None
-        
-        queryset = queryset.filter(
-            Q(visibility='public') |
-            Q(author=user) |
-            (Q(visibility='university') & Q(author__profile__university=user_university) if user_university else Q(pk=None))
-        )
-    else:
-        queryset = queryset.filter(visibility='public')
-    
-    # Extract hashtags from all posts
-    all_hashtags = set()
-    for post in queryset:
-        # Extract hashtags from post content
-        hashtags_in_content = re.findall(r'#(\w+)', post.content)
-        all_hashtags.update(hashtags_in_content)
-    
-    # Filter hashtags based on search query
-    matching_hashtags = [tag for tag in all_hashtags if search_query.lower() in tag.lower()]
-    matching_hashtags = sorted(matching_hashtags, key=lambda x: x.lower())[:20]  # Limit to 20 results
+    matching_hashtags = visible_hashtag_names(Post.visibility_filter(user), search_query)  # Limit to 20 results
     
     return Response(
         {'results': matching_hashtags, 'count': len(matching_hashtags)}, 
@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class ProjectsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'projects'
+    
+    def ready(self):
+        """
+        Import signals when the app is ready
+        """
+        import projects.signals  # noqa
\ No newline at end of file
@@ -0,0 +1,24 @@
+"""
+Caching for the project detail endpoint.
+
+The shared part of a public or university project's representation is
+cached per project; the per-viewer fields (is_team_member, can_edit) and
+the absolute banner URL are filled in on every request. Any change to a
+project or its team drops its entry.
+"""
+from django.core.cache import cache
+
+
+DETAIL_CACHE_TIMEOUT = 60  # seconds
+
+# Fields of serialize_project() that depend on the viewing user
+VIEWER_FIELDS = ('is_team_member', 'can_edit')
+
+
+def detail_cache_key(project_id):
+    return f'project:detail:{project_id}'
+
+
+def invalidate_detail_cache(project_ids):
+    """Drop the cached detail payloads for the given projects"""
+    cache.delete_many([detail_cache_key(project_id) for project_id in project_ids])
@@ -6,16 +6,16 @@ Separate from student/professor views to provide restricted access
 from rest_framework import generics, status, permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
+from rest_framework.exceptions import NotFound
 from django.shortcuts import get_object_or_404
+from django.http import Http404
+from django.db.models import Q
 from .models import Project
+from accounts.models import UserProfile
+from accounts.permissions import IsInvestor, is_investor
 from .serializers import ProjectSerializer
 
 
-def is_investor(user):
-    """Check if user has investor role"""
-    return hasattr(user, 'profile') and user.profile.user_role == 'investor'
-
-
 class InvestorProjectDetailView(generics.RetrieveAPIView):
     """
     Investor-specific project detail view
@@ -25,58 +25,43 @@ class InvestorProjectDetailView(generics.RetrieveAPIView):
     GET /api/projects/investor/<project_id>/
     """
     serializer_class = ProjectSerializer
-    permission_classes = [permissions.IsAuthenticated]
+    permission_classes = [permissions.IsAuthenticated, IsInvestor]
     lookup_field = 'id'
     
     def get_queryset(self):
         """Restrict to public and university projects only"""
         user = self.request.user
         
-        # Only allow investors to use this endpoint
-        if not is_investor(user):
-            return Project.objects.none()
-        
         # Investors can view:
         # 1. Public projects
         # 2. University projects (if they have a university set)
-        queryset = Project.objects.filter(
-            visibility='public'
-        ).select_related(
+        visible = Q(visibility='public')
+        university_id = UserProfile.university_id_for(user)
+        if university_id:
+            visible |= Q(visibility='university', university_id=university_id)
+        
+        return Project.objects.filter(visible).select_related(
             'owner__profile', 'university'
         ).prefetch_related(
             'team_members__profile'
         )
-        
-        # Add university projects if investor has university set
-        if hasattr(user, 'profile') and user.profile.university:
-            from django.db.models import Q
-            queryset = Project.objects.filter(
-                Q(visibility='public') | 
-                Q(visibility='university', university=user.profile.university)
-            ).select_related(
-                'owner__profile', 'university'
-            ).prefetch_related(
-                'team_members__profile'
-            )
-        
-        return queryset
+    
+    def get_object(self):
+        """Answer 404 with the investor-specific message when not visible"""
+        try:
+            return super().get_object()
+        except Http404:
+            raise NotFound({
+                'error': 'Project not found or you do not have permission to view this project.',
+                'detail': 'Investors can only view public and university projects.'
+            })
     
     def retrieve(self, request, *args, **kwargs):
         """
         Override to provide investor-specific project data
         Excludes sensitive information that students/professors might see
         """
-        try:
-            instance = self.get_object()
-        except:
-            return Response(
-                {
-                    'error': 'Project not found or you do not have permission to view this project.',
-                    'detail': 'Investors can only view public and university projects.'
-                },
-                status=status.HTTP_404_NOT_FOUND
-            )
-        
+        instance = self.get_object()
         serializer = self.get_serializer(instance)
         data = serializer.data
         
@@ -0,0 +1,43 @@
+# Generated manually for search optimization
+
+from django.db import migrations
+
+
+# Project search filters with __icontains, which Django renders on PostgreSQL
+# as UPPER("column"::text) LIKE UPPER(%s) (JSON columns included), so the
+# trigram indexes are built on the same expressions
+SEARCH_COLUMNS = ['title', 'summary', 'categories', 'tags']
+
+
+def add_trigram_indexes(apps, schema_editor):
+    """Replace the btree search indexes with pg_trgm GIN indexes on PostgreSQL"""
+    for column in SEARCH_COLUMNS:
+        schema_editor.execute(f"DROP INDEX IF EXISTS idx_project_{column}_search;")
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+        for column in SEARCH_COLUMNS:
+            schema_editor.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_project_{column}_trgm ON projects_project "
+                f"USING gin (UPPER({column}::text) gin_trgm_ops);"
+            )
+
+
+def remove_trigram_indexes(apps, schema_editor):
+    """Restore the original btree search indexes"""
+    for column in SEARCH_COLUMNS:
+        if schema_editor.connection.vendor == 'postgresql':
+            schema_editor.execute(f"DROP INDEX IF EXISTS idx_project_{column}_trgm;")
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_project_{column}_search ON projects_project({column});"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0005_add_search_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_trigram_indexes, remove_trigram_indexes),
+    ]
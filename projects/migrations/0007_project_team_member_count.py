@@ -0,0 +1,31 @@
+# Generated by Django 5.2.6 on 2026-10-15 23:06
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_team_member_count(apps, schema_editor):
+    """Populate the counter from existing team memberships"""
+    Project = apps.get_model('projects', 'Project')
+    Membership = Project.team_members.through
+
+    Project.objects.update(team_member_count=Coalesce(Subquery(
+        Membership.objects.filter(project_id=OuterRef('pk')).values('project_id').annotate(total=Count('id')).values('total')[:1]
+    ), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0006_project_search_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='team_member_count',
+            field=models.PositiveIntegerField(default=0, help_text='Number of team members excluding the owner; maintained by projects.signals'),
+        ),
+        migrations.RunPython(backfill_team_member_count, migrations.RunPython.noop),
+    ]
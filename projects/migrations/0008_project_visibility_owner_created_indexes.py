@@ -0,0 +1,32 @@
+# Generated by Django 5.2.6 on 2026-10-15 23:10
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0007_project_team_member_count'),
+        ('universities', '0002_remove_university_allow_cross_university_collaboration_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='project',
+            name='projects_pr_visibil_b48d7f_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='project',
+            name='projects_pr_created_6b02e3_idx',
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['visibility', '-created_at'], name='projects_pr_visibil_fd28ae_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['owner', '-created_at'], name='projects_pr_owner_i_b5bbe3_idx'),
+        ),
+    ]
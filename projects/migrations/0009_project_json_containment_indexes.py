@@ -0,0 +1,39 @@
+# Generated manually for search optimization
+
+from django.db import migrations
+
+
+# JSON list columns that containment lookups (categories__contains=[...])
+# compile to @> on PostgreSQL. jsonb_path_ops only supports @>, which keeps
+# these indexes much smaller than the default jsonb_ops
+JSON_COLUMNS = ['needs', 'categories', 'tags']
+
+
+def add_containment_indexes(apps, schema_editor):
+    """Create jsonb_path_ops GIN indexes on PostgreSQL"""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for column in JSON_COLUMNS:
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_project_{column}_gin ON projects_project "
+            f"USING gin ({column} jsonb_path_ops);"
+        )
+
+
+def remove_containment_indexes(apps, schema_editor):
+    """Drop the jsonb_path_ops GIN indexes"""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for column in JSON_COLUMNS:
+        schema_editor.execute(f"DROP INDEX IF EXISTS idx_project_{column}_gin;")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0008_project_visibility_owner_created_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_containment_indexes, remove_containment_indexes),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-10-15 23:24
+
+import projects.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0009_project_json_containment_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='project',
+            name='needs',
+            field=models.JSONField(blank=True, default=list, help_text='Array of project needs (design, dev, marketing, etc.)', validators=[projects.models.validate_needs]),
+        ),
+    ]
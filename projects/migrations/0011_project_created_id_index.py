@@ -0,0 +1,20 @@
+# Generated by Django 5.2.6 on 2026-10-16 00:05
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0010_project_needs_validator'),
+        ('universities', '0002_remove_university_allow_cross_university_collaboration_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['-created_at', '-id'], name='projects_pr_created_35e83e_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated manually for search optimization
+
+from django.db import migrations
+
+
+# comprehensive_search and project_search also match needs__icontains;
+# built on the same UPPER(...::text) expression as the 0006 indexes
+def add_trigram_index(apps, schema_editor):
+    """Add a pg_trgm GIN index for needs on PostgreSQL"""
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+        schema_editor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_project_needs_trgm ON projects_project "
+            "USING gin (UPPER(needs::text) gin_trgm_ops);"
+        )
+
+
+def remove_trigram_index(apps, schema_editor):
+    """Drop the needs trigram index"""
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute("DROP INDEX IF EXISTS idx_project_needs_trgm;")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0011_project_created_id_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_trigram_index, remove_trigram_index),
+    ]
@@ -0,0 +1,35 @@
+# Generated manually for query optimization
+
+from django.db import migrations
+
+
+# team_members=user lookups (team_membership_exists, user projects) only
+# need project_id, so cover it alongside user_id; INCLUDE is PostgreSQL-only
+def add_team_members_user_index(apps, schema_editor):
+    """Add a (user_id) index covering project_id on the team members table"""
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            "CREATE INDEX IF NOT EXISTS project_tm_user_project "
+            "ON projects_project_team_members (user_id) INCLUDE (project_id);"
+        )
+    else:
+        schema_editor.execute(
+            "CREATE INDEX IF NOT EXISTS project_tm_user_project "
+            "ON projects_project_team_members (user_id, project_id);"
+        )
+
+
+def remove_team_members_user_index(apps, schema_editor):
+    """Drop the team members user index"""
+    schema_editor.execute("DROP INDEX IF EXISTS project_tm_user_project;")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0012_project_needs_trigram_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_team_members_user_index, remove_team_members_user_index),
+    ]
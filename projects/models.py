@@ -1,9 +1,24 @@
 from django.db import models
+from django.db.models import Q, Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.contrib.auth.models import User
+from accounts.models import UserProfile
+from .cache import invalidate_detail_cache
+from django.core.exceptions import ValidationError
 from django.core.validators import MinLengthValidator, MaxLengthValidator
 import uuid
 
 
+def validate_needs(value):
+    """Ensure needs is a flat list of NEED_CHOICES keys"""
+    if not isinstance(value, list):
+        raise ValidationError("Needs must be a list")
+    allowed = {key for key, _ in Project.NEED_CHOICES}
+    invalid = [need for need in value if need not in allowed]
+    if invalid:
+        raise ValidationError(f"Invalid needs: {', '.join(map(str, invalid))}")
+
+
 class Project(models.Model):
     """
     Project model with one-to-many relationship to users
@@ -79,6 +94,10 @@ class Project(models.Model):
         blank=True,
         help_text="Users who are part of this project"
     )
+    team_member_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of team members excluding the owner; maintained by projects.signals"
+    )
     
     # Project details
     project_type = models.CharField(
@@ -105,6 +124,7 @@ class Project(models.Model):
     needs = models.JSONField(
         default=list,
         blank=True,
+        validators=[validate_needs],
         help_text="Array of project needs (design, dev, marketing, etc.)"
     )
     
@@ -178,8 +198,9 @@ class Project(models.Model):
         indexes = [
             models.Index(fields=['project_type']),
             models.Index(fields=['status']),
-            models.Index(fields=['visibility']),
-            models.Index(fields=['created_at']),
+            models.Index(fields=['visibility', '-created_at']),
+            models.Index(fields=['owner', '-created_at']),
+            models.Index(fields=['-created_at', '-id']),
         ]
     
     def __str__(self):
@@ -187,38 +208,78 @@ class Project(models.Model):
     
     def get_team_count(self):
         """Return total number of team members including owner"""
-        return self.team_members.count() + 1  # +1 for owner
+        return self.team_member_count + 1  # +1 for owner
+    
+    @staticmethod
+    def recount_team_members(project_ids):
+        """Recompute team_member_count for the given projects in one UPDATE"""
+        members = Project.team_members.through.objects.filter(
+            project_id=OuterRef('pk')
+        ).order_by().values('project_id').annotate(total=Count('id')).values('total')
+        Project.objects.filter(pk__in=project_ids).update(
+            team_member_count=Coalesce(Subquery(members[:1]), 0)
+        )
+        invalidate_detail_cache(project_ids)
     
     def is_team_member(self, user):
         """Check if user is part of the project team (including owner)"""
-        return user == self.owner or self.team_members.filter(id=user.id).exists()
+        if user.id == self.owner_id:
+            return True
+        # Use prefetched team members when the queryset loaded them
+        cache = getattr(self, '_prefetched_objects_cache', {})
+        if 'team_members' in cache:
+            return any(member.id == user.id for member in cache['team_members'])
+        return self.team_members.filter(id=user.id).exists()
     
     def add_team_member(self, user):
-        """Add a user to the project team"""
-        if user != self.owner and not self.team_members.filter(id=user.id).exists():
-            self.team_members.add(user)
-            return True
-        return False
+        """
+        Add a user to the project team. Returns False for the owner or an
+        existing member
+        """
+        if user.id == self.owner_id:
+            return False
+        # get_or_create falls back to the existing row when a concurrent
+        # invitation accept inserts it first, so only one caller sees created
+        _, created = Project.team_members.through.objects.get_or_create(
+            project_id=self.pk, user_id=user.id
+        )
+        if not created:
+            return False
+        getattr(self, '_prefetched_objects_cache', {}).pop('team_members', None)
+        # Creating through rows directly sends no m2m_changed
+        Project.recount_team_members([self.pk])
+        return True
     
     def remove_team_member(self, user):
         """Remove a user from the project team"""
-        if user != self.owner and self.team_members.filter(id=user.id).exists():
-            self.team_members.remove(user)
-            return True
-        return False
+        if user.id == self.owner_id:
+            return False
+        # A single DELETE doubles as the membership check
+        deleted, _ = Project.team_members.through.objects.filter(
+            project_id=self.pk, user_id=user.id
+        ).delete()
+        if not deleted:
+            return False
+        getattr(self, '_prefetched_objects_cache', {}).pop('team_members', None)
+        # Deleting through rows directly sends no m2m_changed
+        Project.recount_team_members([self.pk])
+        return True
     
     @property
     def all_team_members(self):
         """Get all team members including the owner"""
-        from django.db.models import Q
-        team_ids = list(self.team_members.values_list('id', flat=True))
-        team_ids.append(self.owner.id)
-        return User.objects.filter(id__in=team_ids)
+        # One query; the membership subquery can't duplicate users like a join
+        team_ids = Project.team_members.through.objects.filter(project_id=self.pk).values('user_id')
+        return User.objects.filter(Q(pk=self.owner_id) | Q(pk__in=team_ids)).select_related('profile')
     
     def save(self, *args, **kwargs):
         """Override save to automatically set university from owner's profile"""
-        if self.owner and hasattr(self.owner, 'profile') and self.owner.profile.university:
-            self.university = self.owner.profile.university
+        # university_id_for reuses a profile the owner already has loaded, so
+        # this costs at most one narrow lookup rather than a full profile fetch
+        if self.owner_id:
+            university_id = UserProfile.university_id_for(self.owner)
+            if university_id:
+                self.university_id = university_id
         super().save(*args, **kwargs)
 
 
@@ -277,7 +338,7 @@ class ProjectInvitation(models.Model):
         """Accept the invitation and add user to project"""
         if self.status == 'pending':
             self.status = 'accepted'
-            self.save()
+            self.save(update_fields=['status', 'updated_at'])
             self.project.add_team_member(self.invitee)
             return True
         return False
@@ -286,7 +347,7 @@ class ProjectInvitation(models.Model):
         """Decline the invitation"""
         if self.status == 'pending':
             self.status = 'declined'
-            self.save()
+            self.save(update_fields=['status', 'updated_at'])
             return True
         return False
     
@@ -294,6 +355,6 @@ class ProjectInvitation(models.Model):
         """Cancel the invitation (by inviter)"""
         if self.status == 'pending':
             self.status = 'cancelled'
-            self.save()
+            self.save(update_fields=['status', 'updated_at'])
             return True
         return False
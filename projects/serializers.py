@@ -1,7 +1,8 @@
+import copy
+
 from rest_framework import serializers
 from django.contrib.auth.models import User
 from .models import Project, ProjectInvitation
-from accounts.serializers import UserProfileSerializer
 
 
 class UserBasicSerializer(serializers.ModelSerializer):
@@ -13,11 +14,26 @@ class UserBasicSerializer(serializers.ModelSerializer):
         model = User
         fields = ['id', 'username', 'email', 'first_name', 'last_name', 'full_name', 'profile']
         read_only_fields = ['id', 'username', 'email']
+        optimizations = {
+            'full_name': ['profile'],
+            'profile': ['profile__university'],
+        }
+    
+    def to_representation(self, instance):
+        """
+        Serialize each user once per response; the same members and owners
+        recur across the projects in a list
+        """
+        cache = self.context.setdefault('_user_basic_cache', {})
+        if instance.pk not in cache:
+            cache[instance.pk] = super().to_representation(instance)
+        return dict(cache[instance.pk])
     
     def get_full_name(self, obj):
-        if hasattr(obj, 'profile'):
+        try:
             return obj.profile.get_full_name()
-        return f"{obj.first_name} {obj.last_name}".strip() or obj.username
+        except User.profile.RelatedObjectDoesNotExist:
+            return f"{obj.first_name} {obj.last_name}".strip() or obj.username
     
     def get_profile(self, obj):
         """Include profile data with full_name"""
@@ -70,6 +86,9 @@ class ProjectSerializer(serializers.ModelSerializer):
             'team_count', 'is_team_member', 'can_edit'
         ]
         read_only_fields = ['id', 'owner', 'university', 'created_at', 'updated_at']
+        optimizations = {
+            'university': ['university'],
+        }
     
     def get_university(self, obj):
         """Return university information"""
@@ -85,15 +104,20 @@ class ProjectSerializer(serializers.ModelSerializer):
         return obj.get_team_count()
     
     def get_is_team_member(self, obj):
+        # Use the annotation from annotate_team_membership when available
+        if hasattr(obj, 'is_team_member_ann'):
+            return obj.is_team_member_ann
         request = self.context.get('request')
         if request and request.user.is_authenticated:
             return obj.is_team_member(request.user)
         return False
     
     def get_can_edit(self, obj):
+        if hasattr(obj, 'can_edit_ann'):
+            return obj.can_edit_ann
         request = self.context.get('request')
         if request and request.user.is_authenticated:
-            return request.user == obj.owner
+            return request.user.id == obj.owner_id
         return False
     
     def create(self, validated_data):
@@ -103,7 +127,84 @@ class ProjectSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class ProjectCreateSerializer(serializers.ModelSerializer):
+_datetime_field = serializers.DateTimeField()
+
+
+def serialize_project(project, context):
+    """
+    Build ProjectSerializer's representation of a project as a plain dict.
+    Used by the project list endpoint, where running the full
+    ModelSerializer per row dominates the response time. Expects the
+    relations loaded by optimize_queryset(..., ProjectSerializer).
+    """
+    request = context.get('request')
+    user_serializer = UserBasicSerializer(context=context)
+    members = project.team_members.all()
+    
+    banner_image = None
+    if project.banner_image:
+        banner_image = project.banner_image.url
+        if request is not None:
+            banner_image = request.build_absolute_uri(banner_image)
+    
+    university = project.university
+    user = request.user if request else None
+    authenticated = user is not None and user.is_authenticated
+    if hasattr(project, 'is_team_member_ann'):
+        is_team_member = project.is_team_member_ann
+    else:
+        is_team_member = project.is_team_member(user) if authenticated else False
+    if hasattr(project, 'can_edit_ann'):
+        can_edit = project.can_edit_ann
+    else:
+        can_edit = user.id == project.owner_id if authenticated else False
+    
+    return {
+        'id': str(project.id),
+        'title': project.title,
+        'owner': user_serializer.to_representation(project.owner),
+        'team_members': [user_serializer.to_representation(member) for member in members],
+        'project_type': project.project_type,
+        'status': project.status,
+        'summary': project.summary,
+        'needs': project.needs,
+        'categories': project.categories,
+        'tags': project.tags,
+        'preview_image': project.preview_image,
+        'banner_style': project.banner_style,
+        'banner_gradient': project.banner_gradient,
+        'banner_image': banner_image,
+        'pitch_url': project.pitch_url,
+        'repo_url': project.repo_url,
+        'visibility': project.visibility,
+        'university': {
+            'id': university.id,
+            'name': university.name,
+            'short_name': getattr(university, 'short_name', university.name)
+        } if university else None,
+        'created_at': _datetime_field.to_representation(project.created_at),
+        'updated_at': _datetime_field.to_representation(project.updated_at),
+        'team_count': project.get_team_count(),
+        'is_team_member': is_team_member,
+        'can_edit': can_edit,
+    }
+
+
+class CachedFieldsMixin:
+    """
+    Build a ModelSerializer's fields once per class and give each instance
+    a copy, skipping the model introspection get_fields() repeats on every
+    request. Only for serializers whose fields don't depend on context.
+    """
+    
+    def get_fields(self):
+        cls = type(self)
+        if '_cached_fields' not in cls.__dict__:
+            cls._cached_fields = super().get_fields()
+        return copy.deepcopy(cls._cached_fields)
+
+
+class ProjectCreateSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Serializer for creating projects"""
     banner_image = serializers.ImageField(required=False, allow_null=True)
 
@@ -124,7 +225,7 @@ class ProjectCreateSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class ProjectUpdateSerializer(serializers.ModelSerializer):
+class ProjectUpdateSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Serializer for updating projects"""
     banner_image = serializers.ImageField(required=False, allow_null=True)
 
@@ -167,9 +268,9 @@ class ProjectInvitationSerializer(serializers.ModelSerializer):
         request = self.context.get('request')
         project_id = self.context.get('project_id')
         
-        # Get the project
+        # Get the project; both membership checks below read the prefetched team
         try:
-            project = Project.objects.get(id=project_id)
+            project = Project.objects.prefetch_related('team_members').get(id=project_id)
         except Project.DoesNotExist:
             raise serializers.ValidationError("Project does not exist.")
         
@@ -177,11 +278,12 @@ class ProjectInvitationSerializer(serializers.ModelSerializer):
         if not project.is_team_member(request.user):
             raise serializers.ValidationError("You don't have permission to invite users to this project.")
         
-        # Get invitee from username
+        # Get invitee from username (already resolved to a User by validation)
         invitee_username = validated_data.pop('invitee_username', None)
         if invitee_username:
-            invitee = self.validate_invitee_username(invitee_username)
-            validated_data['invitee'] = invitee
+            if not isinstance(invitee_username, User):
+                invitee_username = self.validate_invitee_username(invitee_username)
+            validated_data['invitee'] = invitee_username
         
         # Set additional fields
         validated_data['project'] = project
@@ -196,7 +298,7 @@ class ProjectInvitationSerializer(serializers.ModelSerializer):
             project=project,
             invitee=validated_data['invitee'],
             status='pending'
-        ).first()
+        ).exists()
         
         if existing_invitation:
             raise serializers.ValidationError("A pending invitation already exists for this user.")
@@ -204,13 +306,56 @@ class ProjectInvitationSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
+class BulkInvitationSerializer(serializers.Serializer):
+    """Serializer for inviting several users to a project at once"""
+    usernames = serializers.ListField(
+        child=serializers.CharField(), allow_empty=False, max_length=50
+    )
+    message = serializers.CharField(max_length=500, required=False, allow_blank=True)
+    
+    def save(self, project, inviter):
+        """
+        Create every invitation in a single bulk_create; users who are
+        already on the team or already invited are skipped
+        """
+        usernames = set(self.validated_data['usernames'])
+        users = dict(User.objects.filter(username__in=usernames).values_list('id', 'username'))
+        
+        # Existing members and invitations (of any status, since
+        # (project, invitee) is unique) are skipped
+        skip_ids = set(
+            project.team_members.filter(id__in=users).values_list('id', flat=True)
+        ) | set(
+            ProjectInvitation.objects.filter(project=project, invitee_id__in=users).values_list('invitee_id', flat=True)
+        )
+        skip_ids.add(project.owner_id)
+        
+        invitee_ids = [user_id for user_id in users if user_id not in skip_ids]
+        ProjectInvitation.objects.bulk_create([
+            ProjectInvitation(
+                project=project,
+                inviter=inviter,
+                invitee_id=user_id,
+                message=self.validated_data.get('message', '')
+            )
+            for user_id in invitee_ids
+        ], ignore_conflicts=True)
+        
+        return {
+            'invited': sorted(users[user_id] for user_id in invitee_ids),
+            'skipped': sorted(users[user_id] for user_id in users if user_id in skip_ids),
+            'not_found': sorted(usernames - set(users.values())),
+        }
+
+
 class AddTeamMemberSerializer(serializers.Serializer):
     """Serializer for adding team members by username"""
     username = serializers.CharField()
     
     def validate_username(self, value):
         try:
-            user = User.objects.get(username=value)
+            # The view's response reads the profile's full name
+            user = User.objects.select_related('profile').get(username=value)
             return user
         except User.DoesNotExist:
             raise serializers.ValidationError("User with this username does not exist.")
@@ -0,0 +1,48 @@
+"""
+Signal handlers for projects app
+Keep the denormalized Project.team_member_count and the cached project
+detail payloads in step with the team
+"""
+from django.contrib.auth.models import User
+from django.db.models.signals import m2m_changed, pre_delete, post_save, post_delete
+from django.dispatch import receiver
+from .models import Project
+from .cache import invalidate_detail_cache
+
+
+@receiver(m2m_changed, sender=Project.team_members.through)
+def update_team_member_count(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse and action == 'pre_clear':
+        # user.projects.clear() reports no pk_set, so note the projects first
+        instance._cleared_project_ids = list(instance.projects.values_list('id', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        project_ids = [instance.pk]
+    elif action == 'post_clear':
+        project_ids = instance.__dict__.pop('_cleared_project_ids', [])
+    else:
+        project_ids = pk_set
+    if project_ids:
+        Project.recount_team_members(project_ids)
+
+
+# Deleting a user cascades over the auto-created through table, which sends
+# no delete signals of its own
+@receiver(pre_delete, sender=User)
+def remember_member_projects(sender, instance, **kwargs):
+    instance._member_project_ids = list(instance.projects.values_list('id', flat=True))
+
+
+@receiver(post_delete, sender=User)
+def recount_member_projects(sender, instance, **kwargs):
+    project_ids = instance.__dict__.pop('_member_project_ids', [])
+    if project_ids:
+        Project.recount_team_members(project_ids)
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def drop_cached_project_detail(sender, instance, **kwargs):
+    invalidate_detail_cache([instance.pk])
@@ -22,6 +22,7 @@ urlpatterns = [
     
     # Invitations (students/professors only)
     path('<uuid:project_id>/invitations/', views.ProjectInvitationListCreateView.as_view(), name='project-invitations'),
+    path('<uuid:project_id>/invitations/bulk/', views.bulk_invite, name='bulk-invite'),
     path('invitations/me/', views.UserInvitationsView.as_view(), name='my-invitations'),
     path('invitations/<uuid:invitation_id>/respond/', views.respond_to_invitation, name='respond-invitation'),
     
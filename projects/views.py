@@ -1,21 +1,79 @@
 from rest_framework import generics, status, permissions, parsers
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import PageNumberPagination, CursorPagination
 from rest_framework.exceptions import PermissionDenied
 from django.contrib.auth.models import User
-from django.db.models import Q
+from django.db.models import Q, Exists, OuterRef, Value, BooleanField, ExpressionWrapper, Prefetch
 from django.shortcuts import get_object_or_404
+from django.core.cache import cache
+from entrehive_backend.cache import shared_cache_enabled
+from accounts.models import UserProfile
+from accounts.permissions import is_investor
 from .models import Project, ProjectInvitation
+from .cache import DETAIL_CACHE_TIMEOUT, VIEWER_FIELDS, detail_cache_key
+from entrehive_backend.optimizations import optimize_queryset
 from .serializers import (
     ProjectSerializer, ProjectCreateSerializer, ProjectUpdateSerializer,
-    ProjectInvitationSerializer, AddTeamMemberSerializer
+    ProjectInvitationSerializer, AddTeamMemberSerializer, BulkInvitationSerializer,
+    serialize_project
 )
 
 
-def is_investor(user):
-    """Check if user has investor role"""
-    return hasattr(user, 'profile') and user.profile.user_role == 'investor'
+# Columns read by UserBasicSerializer
+USER_BASIC_FIELDS = (
+    'id', 'username', 'email', 'first_name', 'last_name',
+    'profile__first_name', 'profile__last_name', 'profile__profile_picture',
+    'profile__user_role', 'profile__bio',
+    'profile__university__id', 'profile__university__name', 'profile__university__short_name',
+)
+
+# Columns read by serialize_project, minus the prefetched team members
+PROJECT_LIST_FIELDS = (
+    *(field.name for field in Project._meta.concrete_fields),
+    *(f'owner__{field}' for field in USER_BASIC_FIELDS),
+    'university__id', 'university__name', 'university__short_name',
+)
+
+
+def team_members_prefetch(lookup='team_members'):
+    """Team members narrowed to the columns UserBasicSerializer renders"""
+    members = User.objects.select_related('profile__university').only(*USER_BASIC_FIELDS)
+    return Prefetch(lookup, queryset=members)
+
+
+def optimize_project_queryset(queryset):
+    """
+    optimize_queryset() for ProjectSerializer, with the team member
+    prefetch swapped for team_members_prefetch()
+    """
+    return optimize_queryset(queryset, ProjectSerializer).prefetch_related(None).prefetch_related(
+        team_members_prefetch()
+    )
+
+
+def team_membership_exists(user):
+    """
+    EXISTS matching projects that user is a team member of; unlike filtering
+    on team_members it adds no join, so querysets need no DISTINCT
+    """
+    return Exists(Project.team_members.through.objects.filter(project_id=OuterRef('pk'), user_id=user.id))
+
+
+def annotate_team_membership(queryset, user):
+    """
+    Annotate is_team_member_ann and can_edit_ann for the viewing user in SQL
+    so the project serializers read plain booleans instead of checking each
+    project
+    """
+    if not user.is_authenticated:
+        return queryset.annotate(is_team_member_ann=Value(False), can_edit_ann=Value(False))
+    return queryset.annotate(
+        is_team_member_ann=ExpressionWrapper(
+            Q(owner_id=user.id) | team_membership_exists(user), output_field=BooleanField()
+        ),
+        can_edit_ann=ExpressionWrapper(Q(owner_id=user.id), output_field=BooleanField()),
+    )
 
 
 def restrict_investor_access(user):
@@ -33,14 +91,46 @@ class ProjectPagination(PageNumberPagination):
     max_page_size = 100
 
 
-class ProjectListCreateView(generics.ListCreateAPIView):
+class ProjectCursorPagination(CursorPagination):
+    """
+    Keyset pagination on created_at, so deep pages don't pay for an OFFSET.
+    Clients opt in by sending a cursor parameter (empty for the first page)
+    """
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    # The cursor only records the first field. Rows sharing a created_at
+    # value are stepped over with the cursor's offset, and -id keeps their
+    # order stable between requests; ties (microsecond timestamps, so rare)
+    # can still be skipped or repeated if rows among them are added or
+    # removed while a client pages. Project ids are random UUIDs, so there
+    # is no unique monotonic field to page on alone.
+    ordering = ('-created_at', '-id')
+    
+    def decode_cursor(self, request):
+        if not request.query_params.get(self.cursor_query_param):
+            return None
+        return super().decode_cursor(request)
+
+
+class ProjectPaginationMixin:
+    """Page-number pagination unless the request asks for a cursor"""
+    
+    @property
+    def pagination_class(self):
+        request = getattr(self, 'request', None)
+        if request is not None and ProjectCursorPagination.cursor_query_param in request.query_params:
+            return ProjectCursorPagination
+        return ProjectPagination
+
+
+class ProjectListCreateView(ProjectPaginationMixin, generics.ListCreateAPIView):
     """
     List all projects or create a new project
     RESTRICTED: Students and professors only
     """
     serializer_class = ProjectSerializer
     permission_classes = [permissions.IsAuthenticated]
-    pagination_class = ProjectPagination
     parser_classes = [parsers.JSONParser, parsers.MultiPartParser, parsers.FormParser]
     
     def get_queryset(self):
@@ -52,7 +142,7 @@ class ProjectListCreateView(generics.ListCreateAPIView):
         
         # Restrict investor access
         restrict_investor_access(user)
-        queryset = Project.objects.select_related('owner__profile').prefetch_related('team_members__profile')
+        queryset = optimize_project_queryset(Project.objects.only(*PROJECT_LIST_FIELDS))
         
         # Filter by visibility - users can see:
         # 1. Their own projects (any visibility)
@@ -68,10 +158,10 @@ class ProjectListCreateView(generics.ListCreateAPIView):
             visibility_filter |= Q(visibility='university', university=user.profile.university)
         
         # Add user's own projects and projects they're team members of (including private)
-        user_projects_filter = Q(owner=user) | Q(team_members=user)
+        user_projects_filter = Q(owner=user) | team_membership_exists(user)
         
         final_filter = visibility_filter | user_projects_filter
-        queryset = queryset.filter(final_filter).distinct()
+        queryset = queryset.filter(final_filter)
         
         # Apply search filter
         search = self.request.query_params.get('search', None)
@@ -98,13 +188,24 @@ class ProjectListCreateView(generics.ListCreateAPIView):
         if visibility:
             queryset = queryset.filter(visibility=visibility)
         
-        return queryset.order_by('-created_at')
+        return annotate_team_membership(queryset, user).order_by('-created_at')
     
     def get_serializer_class(self):
         if self.request.method == 'POST':
             return ProjectCreateSerializer
         return ProjectSerializer
     
+    def list(self, request, *args, **kwargs):
+        """Render the page with plain dicts instead of ProjectSerializer"""
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        context = self.get_serializer_context()
+        
+        if page is not None:
+            return self.get_paginated_response([serialize_project(project, context) for project in page])
+        
+        return Response([serialize_project(project, context) for project in queryset])
+    
     def perform_create(self, serializer):
         """
         Set the project owner to the current user when creating
@@ -135,7 +236,7 @@ class ProjectDetailView(generics.RetrieveUpdateDestroyAPIView):
     Retrieve, update or delete a project
     RESTRICTED: Students and professors only. Investors use /api/projects/investor/<id>/
     """
-    queryset = Project.objects.select_related('owner__profile').prefetch_related('team_members__profile')
+    queryset = optimize_project_queryset(Project.objects.all())
     serializer_class = ProjectSerializer
     permission_classes = [permissions.IsAuthenticated]
     parser_classes = [parsers.JSONParser, parsers.MultiPartParser, parsers.FormParser]
@@ -150,6 +251,51 @@ class ProjectDetailView(generics.RetrieveUpdateDestroyAPIView):
             return ProjectUpdateSerializer
         return ProjectSerializer
     
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Serve public and university projects from the detail cache when a
+        shared cache backend is configured; only the viewer-specific fields
+        are computed per request
+        """
+        if not shared_cache_enabled():
+            project = self.get_object()
+            return Response(serialize_project(project, self.get_serializer_context()))
+        
+        user = request.user
+        cache_key = detail_cache_key(kwargs['pk'])
+        data = cache.get(cache_key)
+        
+        if data is None:
+            project = self.get_object()
+            data = serialize_project(project, self.get_serializer_context())
+            if project.visibility != 'private':
+                # Keep the banner URL relative; the host comes from each request
+                cached = {key: value for key, value in data.items() if key not in VIEWER_FIELDS}
+                cached['banner_image'] = project.banner_image.url if project.banner_image else None
+                cache.set(cache_key, cached, DETAIL_CACHE_TIMEOUT)
+            return Response(data)
+        
+        is_team_member = user.id == data['owner']['id'] or any(
+            member['id'] == user.id for member in data['team_members']
+        )
+        university = data['university']
+        can_view = is_team_member or data['visibility'] == 'public' or (
+            data['visibility'] == 'university' and university is not None
+            and university['id'] == UserProfile.university_id_for(user)
+        )
+        if not can_view:
+            raise PermissionDenied(
+                detail="You don't have permission to view this project. Private projects are only visible to the owner and team members.",
+                code=403
+            )
+        
+        return Response({
+            **data,
+            'banner_image': request.build_absolute_uri(data['banner_image']) if data['banner_image'] else None,
+            'is_team_member': is_team_member,
+            'can_edit': user.id == data['owner']['id'],
+        })
+    
     def get_object(self):
         """
         Override to check user permissions
@@ -185,8 +331,8 @@ class ProjectDetailView(generics.RetrieveUpdateDestroyAPIView):
         
         # University projects are viewable by users from same university
         if project.visibility == 'university':
-            if hasattr(user, 'profile') and user.profile.university:
-                return project.university == user.profile.university
+            university_id = UserProfile.university_id_for(user)
+            return university_id is not None and project.university_id == university_id
         
         return False
     
@@ -194,9 +340,9 @@ class ProjectDetailView(generics.RetrieveUpdateDestroyAPIView):
         """
         Only project owner can update
         """
-        project = self.get_object()
-        if self.request.user != project.owner:
-            from rest_framework.exceptions import PermissionDenied
+        # update() already loaded and access-checked the instance
+        project = serializer.instance
+        if self.request.user.id != project.owner_id:
             raise PermissionDenied("Only project owner can update the project.")
         
         serializer.save()
@@ -227,20 +373,18 @@ class ProjectDetailView(generics.RetrieveUpdateDestroyAPIView):
         """
         Only project owner can delete
         """
-        if self.request.user != instance.owner:
-            from rest_framework.exceptions import PermissionDenied
+        if instance.owner_id != self.request.user.id:
             raise PermissionDenied("Only project owner can delete the project.")
         
         instance.delete()
 
 
-class UserProjectsView(generics.ListAPIView):
+class UserProjectsView(ProjectPaginationMixin, generics.ListAPIView):
     """
     List projects for a specific user
     """
     serializer_class = ProjectSerializer
     permission_classes = [permissions.IsAuthenticated]
-    pagination_class = ProjectPagination
     
     def get_queryset(self):
         user_id = self.kwargs.get('user_id')
@@ -248,9 +392,9 @@ class UserProjectsView(generics.ListAPIView):
         current_user = self.request.user
         
         # Base filter: projects where target user is owner or team member
-        queryset = Project.objects.select_related('owner__profile').prefetch_related('team_members__profile').filter(
-            Q(owner=target_user) | Q(team_members=target_user)
-        ).distinct()
+        queryset = optimize_project_queryset(Project.objects.only(*PROJECT_LIST_FIELDS)).filter(
+            Q(owner=target_user) | team_membership_exists(target_user)
+        )
         
         # Apply visibility filters - current user can only see:
         # 1. Their own projects (any visibility)
@@ -268,12 +412,12 @@ class UserProjectsView(generics.ListAPIView):
                 visibility_filter |= Q(visibility='university', university=current_user.profile.university)
             
             # Add projects where current user is owner or team member (including private)
-            user_projects_filter = Q(owner=current_user) | Q(team_members=current_user)
+            user_projects_filter = Q(owner=current_user) | team_membership_exists(current_user)
             
             final_filter = visibility_filter | user_projects_filter
             queryset = queryset.filter(final_filter)
         
-        return queryset.order_by('-created_at')
+        return annotate_team_membership(queryset, current_user).order_by('-created_at')
 
 
 @api_view(['POST'])
@@ -286,9 +430,8 @@ def add_team_member(request, project_id):
     # Restrict investor access
     restrict_investor_access(request.user)
     
-    try:
-        project = Project.objects.get(id=project_id)
-    except Project.DoesNotExist:
+    project = Project.objects.filter(id=project_id).first()
+    if project is None:
         return Response(
             {'error': 'Project not found'}, 
             status=status.HTTP_404_NOT_FOUND
@@ -304,6 +447,8 @@ def add_team_member(request, project_id):
     serializer = AddTeamMemberSerializer(data=request.data)
     if serializer.is_valid():
         try:
+            # AddTeamMemberSerializer loaded the user with its profile, so
+            # building the response needs no further queries
             user = serializer.save(project)
             return Response(
                 {
@@ -335,24 +480,23 @@ def remove_team_member(request, project_id, user_id):
     # Restrict investor access
     restrict_investor_access(request.user)
     
-    try:
-        project = Project.objects.get(id=project_id)
-        user_to_remove = User.objects.get(id=user_id)
-    except (Project.DoesNotExist, User.DoesNotExist):
+    project = Project.objects.only('id', 'owner').filter(id=project_id).first()
+    user_to_remove = User.objects.only('id', 'username').filter(id=user_id).first()
+    if project is None or user_to_remove is None:
         return Response(
             {'error': 'Project or user not found'}, 
             status=status.HTTP_404_NOT_FOUND
         )
     
     # Check permissions: owner can remove anyone, users can remove themselves
-    if request.user != project.owner and request.user != user_to_remove:
+    if request.user.id != project.owner_id and request.user.id != user_to_remove.id:
         return Response(
             {'error': 'You don\'t have permission to remove this team member'},
             status=status.HTTP_403_FORBIDDEN
         )
     
     # Cannot remove the owner
-    if user_to_remove == project.owner:
+    if user_to_remove.id == project.owner_id:
         return Response(
             {'error': 'Cannot remove project owner'},
             status=status.HTTP_400_BAD_REQUEST
@@ -380,7 +524,9 @@ class ProjectInvitationListCreateView(generics.ListCreateAPIView):
     
     def get_queryset(self):
         project_id = self.kwargs.get('project_id')
-        return ProjectInvitation.objects.filter(project_id=project_id).order_by('-created_at')
+        return optimize_queryset(
+            ProjectInvitation.objects.filter(project_id=project_id), ProjectInvitationSerializer
+        ).order_by('-created_at')
     
     def get_serializer_context(self):
         context = super().get_serializer_context()
@@ -388,6 +534,38 @@ class ProjectInvitationListCreateView(generics.ListCreateAPIView):
         return context
 
 
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def bulk_invite(request, project_id):
+    """
+    Invite several users to a project by username in one request
+    RESTRICTED: Students and professors only
+    """
+    # Restrict investor access
+    restrict_investor_access(request.user)
+    
+    project = Project.objects.filter(id=project_id).first()
+    if project is None:
+        return Response(
+            {'error': 'Project not found'}, 
+            status=status.HTTP_404_NOT_FOUND
+        )
+    
+    # Check if user can invite (owner or existing team member)
+    if not project.is_team_member(request.user):
+        return Response(
+            {'error': 'You don\'t have permission to invite users to this project'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+    
+    serializer = BulkInvitationSerializer(data=request.data)
+    if serializer.is_valid():
+        result = serializer.save(project, request.user)
+        return Response(result, status=status.HTTP_201_CREATED)
+    
+    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
 class UserInvitationsView(generics.ListAPIView):
     """
     List invitations received by the current user
@@ -396,9 +574,16 @@ class UserInvitationsView(generics.ListAPIView):
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
+        # Team members fan out per project; load just the columns
+        # UserBasicSerializer renders
         return ProjectInvitation.objects.filter(
             invitee=self.request.user,
             status='pending'
+        ).select_related(
+            'project__owner__profile__university', 'project__university',
+            'inviter__profile__university', 'invitee__profile__university'
+        ).prefetch_related(
+            team_members_prefetch('project__team_members')
         ).order_by('-created_at')
 
 
@@ -408,9 +593,8 @@ def respond_to_invitation(request, invitation_id):
     """
     Accept or decline an invitation
     """
-    try:
-        invitation = ProjectInvitation.objects.get(id=invitation_id)
-    except ProjectInvitation.DoesNotExist:
+    invitation = ProjectInvitation.objects.filter(id=invitation_id).first()
+    if invitation is None:
         return Response(
             {'error': 'Invitation not found'}, 
             status=status.HTTP_404_NOT_FOUND
@@ -462,7 +646,7 @@ def project_search(request):
     user = request.user
     
     # Base queryset with proper permissions (same logic as ProjectListCreateView)
-    queryset = Project.objects.select_related('owner__profile').prefetch_related('team_members__profile')
+    queryset = optimize_project_queryset(Project.objects.all())
     
     # Apply visibility filtering
     if user.is_authenticated:
@@ -513,7 +697,8 @@ def project_search(request):
     if status_choices:
         search_filters |= Q(status__in=status_choices)
     
-    queryset = queryset.filter(search_filters).distinct().order_by('-created_at')[:50]  # Limit to 50 results
+    queryset = annotate_team_membership(queryset.filter(search_filters).distinct(), user)
+    queryset = queryset.order_by('-created_at')[:50]  # Limit to 50 results
     
     serializer = ProjectSerializer(queryset, many=True, context={'request': request})
     return Response(
@@ -539,30 +724,32 @@ def categories_search(request):
     user = request.user
     
     # Base queryset with proper permissions
-    queryset = Project.objects.select_related('owner__profile')
+    queryset = Project.objects.all()
     
     # Apply visibility filtering
     if user.is_authenticated:
         visibility_filter = Q(visibility='public')
         
-        if hasattr(user, 'profile') and user.profile.university:
-            visibility_filter |= Q(visibility='university', university=user.profile.university)
+        university_id = UserProfile.university_id_for(user)
+        if university_id:
+            visibility_filter |= Q(visibility='university', university_id=university_id)
         
-        user_projects_filter = Q(owner=user) | Q(team_members=user)
+        user_projects_filter = Q(owner=user) | team_membership_exists(user)
         final_filter = visibility_filter | user_projects_filter
         queryset = queryset.filter(final_filter)
     else:
         queryset = queryset.filter(visibility='public')
     
-    # Extract all categories and tags
+    # Extract all categories and tags, streaming just those two columns
+    # instead of building Project instances
     all_categories = set()
     all_tags = set()
     
-    for project in queryset:
-        if project.categories:
-            all_categories.update(project.categories)
-        if project.tags:
-            all_tags.update(project.tags)
+    for categories, tags in queryset.values_list('categories', 'tags').iterator(chunk_size=500):
+        if categories:
+            all_categories.update(categories)
+        if tags:
+            all_tags.update(tags)
     
     # Filter based on search query
     matching_categories = [cat for cat in all_categories if search_query.lower() in cat.lower()]
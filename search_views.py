@@ -1,21 +1,144 @@
 """
 Comprehensive search views that coordinate search across all apps
 """
+import re
+
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from rest_framework import status
-from django.db.models import Q, Count
-import re
+from django.db.models import Q, Count, Exists, OuterRef
+from django.core.cache import cache
 
-from posts.models import Post
+from posts.models import Post, PostHashtag
 from projects.models import Project
 from accounts.models import UserProfile
 from posts.serializers import PostListSerializer
+from posts.views import annotate_viewer_fields, tagged_project_match, visible_hashtag_names
 from projects.serializers import ProjectSerializer
+from projects.views import team_membership_exists, annotate_team_membership
 from accounts.serializers import PublicUserProfileSerializer
 
 
+TRENDING_CACHE_TIMEOUT = 120  # seconds
+
+# Text a stored hashtag name can contain (see posts.utils.HASHTAG_RE)
+HASHTAG_TEXT_RE = re.compile(r'\w+')
+
+
+def _search_users(request, search_query, post_visibility):
+    """Public profiles matching the query"""
+    user_profiles = UserProfile.objects.filter(
+        is_profile_public=True
+    ).filter(
+        Q(user__username__icontains=search_query) |
+        Q(first_name__icontains=search_query) |
+        Q(last_name__icontains=search_query) |
+        Q(bio__icontains=search_query) |
+        Q(university__name__icontains=search_query)
+    ).order_by('-created_at')[:20]
+    
+    return PublicUserProfileSerializer(user_profiles, many=True, context={'request': request}).data
+
+
+def _search_posts(request, search_query, post_visibility):
+    """Visible posts matching the query"""
+    user = request.user
+    post_queryset = Post.objects.select_related('author', 'author__profile').prefetch_related(
+        'tagged_projects'
+    )
+    
+    # Apply visibility filtering for posts
+    post_queryset = post_queryset.filter(post_visibility)
+    
+    # Search posts
+    post_search_filters = Q()
+    if search_query.startswith('#'):
+        # Posts tagged with a hashtag starting with the query, from the
+        # PostHashtag rows instead of scanning post content
+        hashtag = search_query[1:].lower()
+        post_search_filters |= Exists(PostHashtag.objects.filter(
+            post=OuterRef('pk'), hashtag__name__startswith=hashtag
+        ))
+    else:
+        post_search_filters |= (
+            Q(content__icontains=search_query) |
+            Q(author__username__icontains=search_query) |
+            Q(author__profile__first_name__icontains=search_query) |
+            Q(author__profile__last_name__icontains=search_query) |
+            tagged_project_match(search_query, ['title'])
+        )
+    
+    post_queryset = annotate_viewer_fields(post_queryset, user)
+    posts = post_queryset.filter(post_search_filters).order_by('-created_at')[:20]
+    return PostListSerializer(posts, many=True, context={'request': request}).data
+
+
+def _search_projects(request, search_query, post_visibility):
+    """Visible projects matching the query"""
+    user = request.user
+    project_queryset = Project.objects.select_related('owner__profile').prefetch_related('team_members__profile')
+    
+    # Apply visibility filtering for projects
+    if user.is_authenticated:
+        visibility_filter = Q(visibility='public')
+        
+        university_id = UserProfile.university_id_for(user)
+        if university_id:
+            visibility_filter |= Q(visibility='university', university_id=university_id)
+        
+        user_projects_filter = Q(owner=user) | team_membership_exists(user)
+        final_filter = visibility_filter | user_projects_filter
+        project_queryset = project_queryset.filter(final_filter)
+    else:
+        project_queryset = project_queryset.filter(visibility='public')
+    
+    # Search projects
+    project_search_filters = (
+        Q(title__icontains=search_query) |
+        Q(summary__icontains=search_query) |
+        Q(categories__icontains=search_query) |
+        Q(tags__icontains=search_query) |
+        Q(needs__icontains=search_query) |
+        Q(owner__username__icontains=search_query) |
+        Q(owner__profile__first_name__icontains=search_query) |
+        Q(owner__profile__last_name__icontains=search_query)
+    )
+    
+    projects = annotate_team_membership(
+        project_queryset.filter(project_search_filters), user
+    ).order_by('-created_at')[:20]
+    return ProjectSerializer(projects, many=True, context={'request': request}).data
+
+
+def _search_hashtags(request, search_query, post_visibility):
+    """Hashtags used by visible posts, matched in the hashtag table"""
+    return visible_hashtag_names(post_visibility, search_query.removeprefix('#'))
+
+
+SEARCH_SECTIONS = {
+    'users': _search_users,
+    'posts': _search_posts,
+    'projects': _search_projects,
+    'hashtags': _search_hashtags,
+}
+
+
+def _sections_for_query(search_query):
+    """
+    Names of the search sections that can match search_query. A #tag query
+    only searches posts and hashtags (through the hashtag table), and text
+    that can't be part of a hashtag skips the hashtag lookup.
+    """
+    if search_query.startswith('#'):
+        if not HASHTAG_TEXT_RE.fullmatch(search_query[1:]):
+            return []
+        return ['posts', 'hashtags']
+    if not HASHTAG_TEXT_RE.fullmatch(search_query):
+        return ['users', 'posts', 'projects']
+    return list(SEARCH_SECTIONS)
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticatedOrReadOnly])
 def comprehensive_search(request):
@@ -42,116 +165,13 @@ def comprehensive_search(request):
         'hashtags': []
     }
     
-    # Search Users
-    if search_type in ['all', 'users']:
-        user_profiles = UserProfile.objects.filter(
-            is_profile_public=True
-        ).filter(
-            Q(user__username__icontains=search_query) |
-            Q(first_name__icontains=search_query) |
-            Q(last_name__icontains=search_query) |
-            Q(bio__icontains=search_query) |
-            Q(university__icontains=search_query)
-        ).order_by('-created_at')[:20]
-        
-        user_serializer = PublicUserProfileSerializer(user_profiles, many=True, context={'request': request})
-        results['users'] = user_serializer.data
-    
-    # Search Posts
-    if search_type in ['all', 'posts']:
-        post_queryset = Post.objects.select_related('author', 'author__profile').prefetch_related(
-            'tagged_projects', 'likes', 'comments'
-        ).annotate(
-            likes_count=Count('likes', distinct=True),
-            comments_count=Count('comments', distinct=True)
-        )
-        
-        # Apply visibility filtering for posts
-        if user.is_authenticated:
-            user_university = getattr(user.profile, 'university', None) if hasattr(user, 'profile') else None
-            post_queryset = post_queryset.filter(
-                Q(visibility='public') |
-                Q(author=user) |
-                (Q(visibility='university') & Q(author__profile__university=user_university) if user_university else Q(pk=None))
-            )
-        else:
-            post_queryset = post_queryset.filter(visibility='public')
-        
-        # Search posts
-        post_search_filters = Q()
-        if search_query.startswith('#'):
-            hashtag = search_query[1:]
-            post_search_filters |= Q(content__icontains=f'#{hashtag}')
-        else:
-            post_search_filters |= (
-                Q(content__icontains=search_query) |
-                Q(author__username__icontains=search_query) |
-                Q(author__profile__first_name__icontains=search_query) |
-                Q(author__profile__last_name__icontains=search_query) |
-                Q(tagged_projects__title__icontains=search_query)
-            )
-        
-        posts = post_queryset.filter(post_search_filters).distinct().order_by('-created_at')[:20]
-        post_serializer = PostListSerializer(posts, many=True, context={'request': request})
-        results['posts'] = post_serializer.data
+    # Shared by the posts and hashtags searches
+    post_visibility = Post.visibility_filter(user)
     
-    # Search Projects
-    if search_type in ['all', 'projects']:
-        project_queryset = Project.objects.select_related('owner__profile').prefetch_related('team_members__profile')
-        
-        # Apply visibility filtering for projects
-        if user.is_authenticated:
-            visibility_filter = Q(visibility='public')
-            
-            if hasattr(user, 'profile') and user.profile.university:
-                visibility_filter |= Q(visibility='university', university=user.profile.university)
-            
-            user_projects_filter = Q(owner=user) | Q(team_members=user)
-            final_filter = visibility_filter | user_projects_filter
-            project_queryset = project_queryset.filter(final_filter)
-        else:
-            project_queryset = project_queryset.filter(visibility='public')
-        
-        # Search projects
-        project_search_filters = (
-            Q(title__icontains=search_query) |
-            Q(summary__icontains=search_query) |
-            Q(categories__icontains=search_query) |
-            Q(tags__icontains=search_query) |
-            Q(needs__icontains=search_query) |
-            Q(owner__username__icontains=search_query) |
-            Q(owner__profile__first_name__icontains=search_query) |
-            Q(owner__profile__last_name__icontains=search_query)
-        )
-        
-        projects = project_queryset.filter(project_search_filters).distinct().order_by('-created_at')[:20]
-        project_serializer = ProjectSerializer(projects, many=True, context={'request': request})
-        results['projects'] = project_serializer.data
-    
-    # Extract Hashtags
-    if search_type in ['all', 'hashtags']:
-        # Get hashtags from posts that user can see
-        post_queryset = Post.objects.select_related('author', 'author__profile')
-        
-        if user.is_authenticated:
-            user_university = getattr(user.profile, 'university', None) if hasattr(user, 'profile') else None
-            post_queryset = post_queryset.filter(
-                Q(visibility='public') |
-                Q(author=user) |
-                (Q(visibility='university') & Q(author__profile__university=user_university) if user_university else Q(pk=None))
-            )
-        else:
-            post_queryset = post_queryset.filter(visibility='public')
-        
-        # Extract hashtags from all accessible posts
-        all_hashtags = set()
-        for post in post_queryset:
-            hashtags_in_content = re.findall(r'#(\w+)', post.content)
-            all_hashtags.update(hashtags_in_content)
-        
-        # Filter hashtags based on search query
-        matching_hashtags = [tag for tag in all_hashtags if search_query.lower() in tag.lower()]
-        results['hashtags'] = sorted(matching_hashtags, key=lambda x: x.lower())[:20]
+    # Sections that can't match the query are skipped without a query
+    for name in _sections_for_query(search_query):
+        if search_type in ['all', name]:
+            results[name] = SEARCH_SECTIONS[name](request, search_query, post_visibility)
     
     # Add counts
     total_count = len(results['users']) + len(results['posts']) + len(results['projects']) + len(results['hashtags'])
@@ -171,33 +191,29 @@ def trending_hashtags(request):
     Get trending hashtags from recent posts
     """
     user = request.user
+    university_id = UserProfile.university_id_for(user)
     
-    # Get recent posts (last 30 days or recent 1000 posts)
-    post_queryset = Post.objects.select_related('author', 'author__profile')
+    # Trending is shared by everyone at the same university (or by everyone
+    # without one), so it only counts public and university posts
+    cache_key = f'trending:hashtags:{university_id or "public"}'
+    trending_hashtags = cache.get(cache_key)
     
-    if user.is_authenticated:
-        user_university = getattr(user.profile, 'university', None) if hasattr(user, 'profile') else None
-        post_queryset = post_queryset.filter(
-            Q(visibility='public') |
-            Q(author=user) |
-            (Q(visibility='university') & Q(author__profile__university=user_university) if user_university else Q(pk=None))
-        )
-    else:
-        post_queryset = post_queryset.filter(visibility='public')
-    
-    # Get recent posts and extract hashtags
-    recent_posts = post_queryset.order_by('-created_at')[:1000]
-    hashtag_counts = {}
-    
-    for post in recent_posts:
-        hashtags = re.findall(r'#(\w+)', post.content)
-        for hashtag in hashtags:
-            hashtag_lower = hashtag.lower()
-            hashtag_counts[hashtag_lower] = hashtag_counts.get(hashtag_lower, 0) + 1
-    
-    # Sort by frequency and return top trending hashtags
-    trending = sorted(hashtag_counts.items(), key=lambda x: x[1], reverse=True)[:20]
-    trending_hashtags = [{'hashtag': hashtag, 'count': count} for hashtag, count in trending]
+    if trending_hashtags is None:
+        visible = Q(visibility='public')
+        if university_id:
+            visible |= Q(visibility='university', university_id=university_id)
+        
+        # Count hashtags over the 1000 most recent visible posts in SQL, from
+        # the PostHashtag rows written when each post was saved
+        recent_post_ids = Post.objects.filter(visible).order_by('-created_at').values('id')[:1000]
+        
+        trending = PostHashtag.objects.filter(
+            post_id__in=recent_post_ids
+        ).values('hashtag__name').annotate(
+            count=Count('id')
+        ).order_by('-count', 'hashtag__name')[:20]
+        trending_hashtags = [{'hashtag': row['hashtag__name'], 'count': row['count']} for row in trending]
+        cache.set(cache_key, trending_hashtags, TRENDING_CACHE_TIMEOUT)
     
     return Response({
         'results': trending_hashtags,
@@ -37,7 +37,6 @@ class UniversityAdmin(admin.ModelAdmin):
     actions = ['update_statistics']
     
     def update_statistics(self, request, queryset):
-        for university in queryset:
-            university.update_statistics()
-        self.message_user(request, f'Statistics updated for {queryset.count()} universities.')
+        updated = University.refresh_statistics(queryset)
+        self.message_user(request, f'Statistics updated for {updated} universities.')
     update_statistics.short_description = "Update statistics for selected universities"
@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class UniversitiesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'universities'
+    
+    def ready(self):
+        """
+        Import signals when the app is ready
+        """
+        import universities.signals  # noqa
@@ -0,0 +1,21 @@
+"""
+Caching for email-domain verification.
+
+Each verified domain maps to the summary of its university. Unknown
+domains are not cached, so a newly registered university is accepted
+right away. Saving or deleting a university drops the entries for its
+old and new domain.
+"""
+from django.core.cache import cache
+
+
+DOMAIN_CACHE_TIMEOUT = 3600  # seconds
+
+
+def domain_cache_key(domain):
+    return f'uni:domain:{domain}'
+
+
+def invalidate_domain_cache(domains):
+    """Drop the cached verification results for the given domains"""
+    cache.delete_many([domain_cache_key(domain) for domain in domains if domain])
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-15 23:25
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('universities', '0002_remove_university_allow_cross_university_collaboration_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='university',
+            index=models.Index(django.db.models.functions.text.Lower('email_domain'), name='uni_email_domain_lower_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.6 on 2026-10-15 23:25
+
+from django.db import migrations
+
+
+def normalize_email_domains(apps, schema_editor):
+    """Store existing email domains lowercase and without a leading @"""
+    University = apps.get_model('universities', 'University')
+    for university in University.objects.exclude(email_domain__isnull=True).exclude(email_domain=''):
+        normalized = university.email_domain.strip().lstrip('@').lower()
+        if normalized != university.email_domain:
+            University.objects.filter(pk=university.pk).update(email_domain=normalized)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('universities', '0003_university_email_domain_lower_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_email_domains, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='university',
+            name='uni_email_domain_lower_idx',
+        ),
+    ]
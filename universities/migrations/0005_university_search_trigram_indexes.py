@@ -0,0 +1,39 @@
+# Generated manually for search optimization
+
+from django.db import migrations
+
+
+# The search action, search_universities_by_domain and the SearchFilter
+# backends match these columns with __icontains, which Django renders on
+# PostgreSQL as UPPER("column"::text) LIKE UPPER(%s); the trigram indexes
+# are built on the same expressions
+SEARCH_COLUMNS = ['name', 'short_name', 'city', 'email_domain', 'country']
+
+
+def add_trigram_indexes(apps, schema_editor):
+    """Add pg_trgm GIN indexes for the university search columns on PostgreSQL"""
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+        for column in SEARCH_COLUMNS:
+            schema_editor.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_university_{column}_trgm ON universities_university "
+                f"USING gin (UPPER({column}::text) gin_trgm_ops);"
+            )
+
+
+def remove_trigram_indexes(apps, schema_editor):
+    """Drop the university search trigram indexes"""
+    if schema_editor.connection.vendor == 'postgresql':
+        for column in SEARCH_COLUMNS:
+            schema_editor.execute(f"DROP INDEX IF EXISTS idx_university_{column}_trgm;")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('universities', '0004_normalize_university_email_domain'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_trigram_indexes, remove_trigram_indexes),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.6 on 2026-10-15 23:28
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('universities', '0005_university_search_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='university',
+            name='display_name',
+            field=models.GeneratedField(db_persist=True, expression=models.Case(models.When(models.Q(('short_name__isnull', False), models.Q(('short_name', ''), _negated=True)), then=django.db.models.functions.text.Concat('name', models.Value(' ('), 'short_name', models.Value(')'))), default='name'), help_text='Name with short name if available', output_field=models.CharField(max_length=253)),
+        ),
+        migrations.AddField(
+            model_name='university',
+            name='full_location',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.functions.text.Concat('city', models.Value(', '), 'state_province', models.Value(', '), 'country'), help_text='Formatted location string', output_field=models.CharField(max_length=304)),
+        ),
+    ]
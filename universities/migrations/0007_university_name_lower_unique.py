@@ -0,0 +1,46 @@
+# Generated by Django 5.2.6 on 2026-10-15 23:30
+
+import django.db.models.functions.text
+from django.db import migrations, models
+from django.db.models.functions import Lower
+
+
+def rename_case_duplicate_names(apps, schema_editor):
+    """
+    Give universities whose names differ only by case distinct names so the
+    case-insensitive unique constraint can be added; the oldest row keeps its
+    name and the others get a numbered suffix
+    """
+    University = apps.get_model('universities', 'University')
+    duplicates = (
+        University.objects.annotate(name_lower=Lower('name'))
+        .values('name_lower')
+        .annotate(total=models.Count('id'))
+        .filter(total__gt=1)
+        .values_list('name_lower', flat=True)
+    )
+    for name_lower in list(duplicates):
+        universities = University.objects.filter(name__iexact=name_lower).order_by('created_at', 'id')
+        for university in universities[1:]:
+            suffix = 2
+            while True:
+                new_name = f"{university.name[:190]} ({suffix})"
+                if not University.objects.filter(name__iexact=new_name).exists():
+                    break
+                suffix += 1
+            University.objects.filter(pk=university.pk).update(name=new_name)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('universities', '0006_university_display_fields'),
+    ]
+
+    operations = [
+        migrations.RunPython(rename_case_duplicate_names, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='university',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('name'), name='uni_name_lower_unique', violation_error_message='A university with this name already exists.'),
+        ),
+    ]
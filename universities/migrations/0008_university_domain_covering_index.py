@@ -0,0 +1,21 @@
+# Generated by Django 5.2.6 on 2026-10-15 23:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('universities', '0007_university_name_lower_unique'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='university',
+            name='universitie_email_d_7b2d1a_idx',
+        ),
+        migrations.AddIndex(
+            model_name='university',
+            index=models.Index(fields=['email_domain'], include=('id', 'name', 'short_name', 'city', 'country'), name='uni_domain_covering'),
+        ),
+    ]
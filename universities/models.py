@@ -1,7 +1,35 @@
 from django.db import models
+from django.db.models import Case, Q, Value, When
+from django.db.models.functions import Concat, Lower
 import uuid
 
 
+class UniversityQuerySet(models.QuerySet):
+    """
+    Row projections matching the university list and stats representations,
+    so list endpoints read plain values instead of model instances and skip
+    description, website and the other unused fields
+    """
+    
+    # Columns of UniversityListSerializer, in its field order
+    LIST_FIELDS = (
+        'id', 'name', 'short_name', 'display_name', 'city', 'state_province',
+        'country', 'full_location', 'university_type', 'logo', 'student_count'
+    )
+    
+    # Columns of UniversityStatsSerializer, in its field order
+    STATS_FIELDS = (
+        'id', 'name', 'short_name', 'display_name', 'full_location',
+        'student_count', 'professor_count', 'project_count', 'updated_at'
+    )
+    
+    def list_rows(self):
+        return self.values(*self.LIST_FIELDS)
+    
+    def stats_rows(self):
+        return self.values(*self.STATS_FIELDS)
+
+
 class University(models.Model):
     """
     University model to manage institutions and their settings
@@ -67,6 +95,26 @@ class University(models.Model):
     )
     
     
+    # Display strings, computed and stored by the database on write
+    display_name = models.GeneratedField(
+        expression=Case(
+            When(
+                Q(short_name__isnull=False) & ~Q(short_name=''),
+                then=Concat('name', Value(' ('), 'short_name', Value(')'))
+            ),
+            default='name'
+        ),
+        output_field=models.CharField(max_length=253),
+        db_persist=True,
+        help_text="Name with short name if available"
+    )
+    full_location = models.GeneratedField(
+        expression=Concat('city', Value(', '), 'state_province', Value(', '), 'country'),
+        output_field=models.CharField(max_length=304),
+        db_persist=True,
+        help_text="Formatted location string"
+    )
+    
     # Statistics (computed fields)
     student_count = models.PositiveIntegerField(
         default=0,
@@ -85,6 +133,8 @@ class University(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = UniversityQuerySet.as_manager()
+    
     class Meta:
         verbose_name = "University"
         verbose_name_plural = "Universities"
@@ -92,31 +142,74 @@ class University(models.Model):
         indexes = [
             models.Index(fields=['name']),
             models.Index(fields=['country', 'state_province']),
-            models.Index(fields=['email_domain']),
+            # Covers the verify endpoints' lookup (VERIFY_FIELDS) so PostgreSQL
+            # can answer it from the index alone
+            models.Index(
+                fields=['email_domain'],
+                include=['id', 'name', 'short_name', 'city', 'country'],
+                name='uni_domain_covering'
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                Lower('name'),
+                name='uni_name_lower_unique',
+                violation_error_message="A university with this name already exists."
+            ),
         ]
     
     def __str__(self):
         return f"{self.name} ({self.city}, {self.country})"
     
-    def get_full_location(self):
-        """Return formatted location string"""
-        return f"{self.city}, {self.state_province}, {self.country}"
+    def save(self, *args, **kwargs):
+        self.email_domain = self.normalize_email_domain(self.email_domain)
+        super().save(*args, **kwargs)
     
-    def get_display_name(self):
-        """Return display name with short name if available"""
-        if self.short_name:
-            return f"{self.name} ({self.short_name})"
-        return self.name
+    @staticmethod
+    def normalize_email_domain(value):
+        """Canonical stored form of an email domain: lowercase, no leading @"""
+        if not value:
+            return value
+        return value.strip().lstrip('@').lower()
+    
+    @staticmethod
+    def refresh_statistics(queryset):
+        """Recompute statistics for every university in queryset in one UPDATE"""
+        from django.db.models import Count, OuterRef, Subquery
+        from django.db.models.functions import Coalesce
+        from django.utils import timezone
+        from accounts.models import UserProfile
+        from projects.models import Project
+        
+        def count_per_university(rows, university_field):
+            return Coalesce(Subquery(
+                rows.filter(**{university_field: OuterRef('pk')}).order_by().values(
+                    university_field
+                ).annotate(total=Count('id')).values('total')[:1]
+            ), 0)
+        
+        return queryset.order_by().update(
+            student_count=count_per_university(UserProfile.objects.filter(user_role='student'), 'university'),
+            professor_count=count_per_university(UserProfile.objects.filter(user_role='professor'), 'university'),
+            project_count=count_per_university(
+                Project.objects.filter(visibility__in=['university', 'public']), 'owner__profile__university'
+            ),
+            updated_at=timezone.now(),
+        )
     
     def update_statistics(self):
         """Update computed statistics"""
-        from django.contrib.auth.models import User
+        from django.db.models import Count, Q
+        from accounts.models import UserProfile
         from projects.models import Project
         
-        # Update user counts
-        university_users = User.objects.filter(profile__university=self)
-        self.student_count = university_users.filter(profile__user_role='student').count()
-        self.professor_count = university_users.filter(profile__user_role='professor').count()
+        # Update user counts in one conditional aggregate
+        user_counts = UserProfile.objects.filter(university=self).aggregate(
+            students=Count('id', filter=Q(user_role='student')),
+            professors=Count('id', filter=Q(user_role='professor')),
+        )
+        self.student_count = user_counts['students']
+        self.professor_count = user_counts['professors']
         
         # Update project count
         self.project_count = Project.objects.filter(
@@ -124,4 +217,4 @@ class University(models.Model):
             visibility__in=['university', 'public']
         ).count()
         
-        self.save()
+        self.save(update_fields=['student_count', 'professor_count', 'project_count', 'updated_at'])
@@ -1,8 +1,62 @@
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
 from .models import University
 
 
-class UniversitySerializer(serializers.ModelSerializer):
+NAME_EXISTS_ERROR = "A university with this name already exists."
+
+
+class UniversityNameMixin:
+    """
+    Case-insensitive name uniqueness for serializers that write a
+    university, matching the uni_name_lower_unique constraint. The
+    constraint still catches a concurrent write with the same name.
+    """
+    
+    def _name_taken(self, name):
+        clashes = University.objects.filter(name__iexact=name)
+        if self.instance is not None:
+            clashes = clashes.exclude(pk=self.instance.pk)
+        return clashes.exists()
+    
+    def validate_name(self, value):
+        if self._name_taken(value):
+            raise serializers.ValidationError(NAME_EXISTS_ERROR)
+        return value
+    
+    def _name_clash_error(self, validated_data):
+        """
+        The validation error for an IntegrityError raised by a save, or None
+        when it wasn't caused by the name; any other integrity failure is a
+        real error
+        """
+        name = validated_data.get('name')
+        if name is not None and self._name_taken(name):
+            return serializers.ValidationError({'name': [NAME_EXISTS_ERROR]})
+        return None
+    
+    def create(self, validated_data):
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError:
+            error = self._name_clash_error(validated_data)
+            if error is None:
+                raise
+            raise error
+    
+    def update(self, instance, validated_data):
+        try:
+            with transaction.atomic():
+                return super().update(instance, validated_data)
+        except IntegrityError:
+            error = self._name_clash_error(validated_data)
+            if error is None:
+                raise
+            raise error
+
+
+class UniversitySerializer(UniversityNameMixin, serializers.ModelSerializer):
     """
     Serializer for University model with all fields
     """
@@ -22,15 +76,14 @@ class UniversitySerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'student_count', 'professor_count', 'project_count', 'created_at', 'updated_at']
+        # validate_name replaces the exact-match UniqueValidator
+        extra_kwargs = {'name': {'validators': []}}
 
 
 class UniversityListSerializer(serializers.ModelSerializer):
     """
     Lightweight serializer for listing universities
     """
-    full_location = serializers.SerializerMethodField()
-    display_name = serializers.SerializerMethodField()
-    
     class Meta:
         model = University
         fields = [
@@ -39,15 +92,9 @@ class UniversityListSerializer(serializers.ModelSerializer):
             'university_type', 'logo', 'student_count'
         ]
         read_only_fields = ['id', 'student_count']
-    
-    def get_full_location(self, obj):
-        return obj.get_full_location()
-    
-    def get_display_name(self, obj):
-        return obj.get_display_name()
 
 
-class UniversityCreateSerializer(serializers.ModelSerializer):
+class UniversityCreateSerializer(UniversityNameMixin, serializers.ModelSerializer):
     """
     Serializer for creating new universities
     """
@@ -58,28 +105,18 @@ class UniversityCreateSerializer(serializers.ModelSerializer):
             'city', 'state_province', 'country',
             'website', 'email_domain', 'logo', 'description'
         ]
-    
-    def validate_name(self, value):
-        """Ensure university name is unique"""
-        if University.objects.filter(name__iexact=value).exists():
-            raise serializers.ValidationError("A university with this name already exists.")
-        return value
+        # validate_name replaces the exact-match UniqueValidator
+        extra_kwargs = {'name': {'validators': []}}
     
     def validate_email_domain(self, value):
-        """Validate email domain format if provided"""
-        if value and not value.startswith('@'):
-            # Add @ prefix if not present
-            value = '@' + value
-        return value
+        """Store the email domain lowercase and without a leading @"""
+        return University.normalize_email_domain(value)
 
 
 class UniversityStatsSerializer(serializers.ModelSerializer):
     """
     Serializer for university statistics
     """
-    full_location = serializers.SerializerMethodField()
-    display_name = serializers.SerializerMethodField()
-    
     class Meta:
         model = University
         fields = [
@@ -88,9 +125,24 @@ class UniversityStatsSerializer(serializers.ModelSerializer):
             'updated_at'
         ]
         read_only_fields = ['id', 'student_count', 'professor_count', 'project_count', 'updated_at']
-    
-    def get_full_location(self, obj):
-        return obj.get_full_location()
-    
-    def get_display_name(self, obj):
-        return obj.get_display_name()
+
+
+def serialize_university_rows(rows, request=None):
+    """
+    Finish list_rows()/stats_rows() values into the same output as
+    UniversityListSerializer/UniversityStatsSerializer, without a
+    ModelSerializer pass per row. Logo URLs are absolute when a request
+    is given, as ImageField renders them.
+    """
+    logo_storage = University._meta.get_field('logo').storage
+    rows = list(rows)
+    for row in rows:
+        row['id'] = str(row['id'])
+        if 'logo' in row:
+            logo = row['logo']
+            if logo:
+                logo = logo_storage.url(logo)
+                if request is not None:
+                    logo = request.build_absolute_uri(logo)
+            row['logo'] = logo or None
+    return rows
@@ -0,0 +1,34 @@
+"""
+Signal handlers for universities app
+Keep the cached email-domain verification results in step with universities
+"""
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from .models import University
+from .cache import invalidate_domain_cache
+
+
+def saves_email_domain(update_fields):
+    """False for saves limited to other fields, such as update_statistics()"""
+    return update_fields is None or 'email_domain' in update_fields
+
+
+@receiver(pre_save, sender=University)
+def remember_email_domain(sender, instance, update_fields=None, **kwargs):
+    # A changed domain leaves a stale entry under the old one
+    if instance.pk is None or not saves_email_domain(update_fields):
+        return
+    instance._previous_email_domain = University.objects.filter(pk=instance.pk).values_list(
+        'email_domain', flat=True
+    ).first()
+
+
+@receiver(post_save, sender=University)
+@receiver(post_delete, sender=University)
+def drop_cached_domain(sender, instance, **kwargs):
+    if not saves_email_domain(kwargs.get('update_fields')):
+        return
+    invalidate_domain_cache([
+        instance.email_domain,
+        instance.__dict__.pop('_previous_email_domain', None),
+    ])
@@ -7,6 +7,7 @@ from .views import (
     UniversityByCountryView,
     UniversityTypesView,
     verify_email_domain,
+    verify_email_domains_bulk,
     search_universities_by_domain
 )
 
@@ -19,6 +20,7 @@ app_name = 'universities'
 urlpatterns = [
     # Email verification endpoints (must come before ViewSet routes)
     path('api/universities/verify-email/', verify_email_domain, name='verify-email-domain'),
+    path('api/universities/verify-emails/', verify_email_domains_bulk, name='verify-email-domains-bulk'),
     path('api/universities/search-by-domain/', search_universities_by_domain, name='search-universities-by-domain'),
     
     # Additional simple views
@@ -3,20 +3,63 @@ from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAdminUser, AllowAny
 from rest_framework.viewsets import ModelViewSet
+from rest_framework.pagination import PageNumberPagination
 from django_filters.rest_framework import DjangoFilterBackend
 from django.db.models import Q
+from django.core.cache import cache
+from entrehive_backend.cache import shared_cache_enabled
 import re
 
 from .models import University
+from .cache import DOMAIN_CACHE_TIMEOUT, domain_cache_key
 from .serializers import (
     UniversitySerializer, 
     UniversityListSerializer, 
     UniversityCreateSerializer,
-    UniversityStatsSerializer
+    UniversityStatsSerializer,
+    serialize_university_rows
 )
 
 
-class UniversityViewSet(ModelViewSet):
+EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+# Fields returned for a university matched by the verify endpoints
+VERIFY_FIELDS = ('id', 'name', 'short_name', 'city', 'country')
+
+# Upper bound on emails accepted by verify_email_domains_bulk
+MAX_BULK_VERIFY_EMAILS = 100
+
+# Error bodies for rejected verify/search input; DRF doesn't modify response
+# data, so the same dicts are shared across requests
+EMAIL_REQUIRED_ERROR = {'error': 'Email is required'}
+INVALID_EMAIL_ERROR = {'error': 'Invalid email format'}
+EMAILS_LIST_REQUIRED_ERROR = {'error': 'emails must be a non-empty list'}
+TOO_MANY_EMAILS_ERROR = {'error': f'At most {MAX_BULK_VERIFY_EMAILS} emails can be verified at once'}
+DOMAIN_QUERY_TOO_SHORT_ERROR = {'error': 'Domain query must be at least 3 characters'}
+
+# UniversityTypesView's response; built once since the choices are fixed
+UNIVERSITY_TYPES_PAYLOAD = {
+    'university_types': [
+        {'value': choice[0], 'label': choice[1]} for choice in University.UNIVERSITY_TYPE_CHOICES
+    ]
+}
+
+
+class UniversityPagination(PageNumberPagination):
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+
+class UniversityRowsListMixin:
+    """List action that renders list_rows() values instead of model instances"""
+    
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        return Response(serialize_university_rows(queryset.list_rows(), request))
+
+
+class UniversityViewSet(UniversityRowsListMixin, ModelViewSet):
     """
     ViewSet for University CRUD operations
     """
@@ -58,34 +101,34 @@ class UniversityViewSet(ModelViewSet):
     @action(detail=False, methods=['post'], permission_classes=[IsAuthenticated, IsAdminUser])
     def update_all_stats(self, request):
         """Update statistics for all universities"""
-        universities = University.objects.all()
-        for university in universities:
-            university.update_statistics()
-        return Response({'message': f'Statistics updated for {universities.count()} universities'})
+        updated = University.refresh_statistics(University.objects.all())
+        return Response({'message': f'Statistics updated for {updated} universities'})
     
     @action(detail=False, methods=['get'])
     def stats(self, request):
         """Get statistics for all universities"""
-        universities = University.objects.all()
-        serializer = UniversityStatsSerializer(universities, many=True)
-        return Response(serializer.data)
+        # Page the results so the response stays bounded as universities grow
+        paginator = UniversityPagination()
+        page = paginator.paginate_queryset(self.get_queryset().stats_rows(), request, view=self)
+        return paginator.get_paginated_response(serialize_university_rows(page))
     
     @action(detail=False, methods=['get'])
     def search(self, request):
-        """Advanced search for universities"""
+        """
+        Search for universities; kept for existing clients, new ones should
+        use the list filters (search=, country=, university_type=)
+        """
         query = request.query_params.get('q', '')
         country = request.query_params.get('country', '')
         university_type = request.query_params.get('type', '')
         
-        queryset = University.objects.all()
+        queryset = self.get_queryset()
         
         if query:
-            queryset = queryset.filter(
-                Q(name__icontains=query) |
-                Q(short_name__icontains=query) |
-                Q(city__icontains=query) |
-                Q(email_domain__icontains=query)
-            )
+            search_filter = Q()
+            for field in self.search_fields:
+                search_filter |= Q(**{f'{field}__icontains': query})
+            queryset = queryset.filter(search_filter)
         
         if country:
             queryset = queryset.filter(country__icontains=country)
@@ -93,11 +136,10 @@ class UniversityViewSet(ModelViewSet):
         if university_type:
             queryset = queryset.filter(university_type=university_type)
         
-        serializer = UniversityListSerializer(queryset, many=True)
-        return Response(serializer.data)
+        return Response(serialize_university_rows(queryset.list_rows()))
 
 
-class UniversityListView(generics.ListAPIView):
+class UniversityListView(UniversityRowsListMixin, generics.ListAPIView):
     """
     Simple list view for universities
     """
@@ -118,7 +160,7 @@ class UniversityDetailView(generics.RetrieveAPIView):
     lookup_field = 'pk'
 
 
-class UniversityByCountryView(generics.ListAPIView):
+class UniversityByCountryView(UniversityRowsListMixin, generics.ListAPIView):
     """
     List universities by country
     """
@@ -134,8 +176,50 @@ class UniversityTypesView(generics.GenericAPIView):
     Get available university types
     """
     def get(self, request):
-        types = [{'value': choice[0], 'label': choice[1]} for choice in University.UNIVERSITY_TYPE_CHOICES]
-        return Response({'university_types': types})
+        return Response(UNIVERSITY_TYPES_PAYLOAD)
+
+
+def verified_university_data(university):
+    """University summary returned by the verify endpoints (VERIFY_FIELDS)"""
+    return {
+        'id': str(university.id),
+        'name': university.name,
+        'short_name': university.short_name,
+        'city': university.city,
+        'country': university.country
+    }
+
+
+def lookup_verified_universities(domains):
+    """
+    Map each domain to verified_university_data() for its university, or
+    None, reading through the domain cache when a shared backend is
+    configured; the rest are looked up in one query
+    """
+    use_cache = shared_cache_enabled()
+    keys = {domain_cache_key(domain): domain for domain in domains}
+    found = {}
+    if use_cache:
+        found = {keys[key]: data for key, data in cache.get_many(keys).items()}
+    
+    missing = [domain for domain in keys.values() if domain not in found]
+    if missing:
+        fresh = dict.fromkeys(missing)
+        # email_domain is stored normalized (see University.normalize_email_domain);
+        # rows come ordered by name, so the first university per domain wins
+        for university in University.objects.filter(email_domain__in=missing).only(
+            'email_domain', *VERIFY_FIELDS
+        ):
+            if fresh[university.email_domain] is None:
+                fresh[university.email_domain] = verified_university_data(university)
+        if use_cache:
+            # Only matches are cached; an unknown domain may be registered any time
+            cache.set_many(
+                {domain_cache_key(domain): data for domain, data in fresh.items() if data is not None},
+                DOMAIN_CACHE_TIMEOUT
+            )
+        found.update(fresh)
+    return found
 
 
 @api_view(['POST'])
@@ -149,28 +233,11 @@ def verify_email_domain(request):
     
     if not email:
         return Response(
-            {'error': 'Email is required'}, 
-            status=status.HTTP_400_BAD_REQUEST
-        )
-    
-    # Validate email format
-    email_regex = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    if not re.match(email_regex, email):
-        return Response(
-            {'error': 'Invalid email format'}, 
-            status=status.HTTP_400_BAD_REQUEST
-        )
-    
-    # Extract domain from email
-    try:
-        domain = email.split('@')[1]
-    except IndexError:
-        return Response(
-            {'error': 'Invalid email format'}, 
+            EMAIL_REQUIRED_ERROR, 
             status=status.HTTP_400_BAD_REQUEST
         )
     
-    # Investors can bypass university verification
+    # Investors can bypass university verification, so skip parsing the email
     if user_role == 'investor':
         return Response({
             'verified': True,
@@ -179,32 +246,24 @@ def verify_email_domain(request):
             'bypass_reason': 'investor'
         })
     
-    # Check if domain matches any university
-    # Look for universities with email_domain that matches
-    university = None
-    
-    # Try exact domain match first
-    university = University.objects.filter(email_domain__iexact=domain).first()
+    # Validate email format
+    if not EMAIL_RE.match(email):
+        return Response(
+            INVALID_EMAIL_ERROR, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
     
-    # If no exact match, try with @ prefix (in case stored with @)
-    if not university:
-        university = University.objects.filter(email_domain__iexact=f'@{domain}').first()
+    # Extract domain from email (EMAIL_RE guarantees a single @)
+    domain = email.rpartition('@')[2]
     
-    # If still no match, try without @ prefix (in case stored without @)
-    if not university:
-        university = University.objects.filter(email_domain__iexact=domain.replace('@', '')).first()
+    # Check if domain matches any university
+    university = lookup_verified_universities([domain])[domain]
     
     if university:
         return Response({
             'verified': True,
-            'university': {
-                'id': str(university.id),
-                'name': university.name,
-                'short_name': university.short_name,
-                'city': university.city,
-                'country': university.country
-            },
-            'message': f'Email domain verified for {university.name}'
+            'university': university,
+            'message': f"Email domain verified for {university['name']}"
         })
     else:
         return Response({
@@ -215,6 +274,51 @@ def verify_email_domain(request):
         }, status=status.HTTP_403_FORBIDDEN)
 
 
+@api_view(['POST'])
+@permission_classes([AllowAny])
+def verify_email_domains_bulk(request):
+    """
+    Verify a list of emails against registered university domains
+    POST /api/universities/verify-emails/ with {"emails": [...]}
+    Looks up every uncached domain in one query; results follow input order
+    """
+    emails = request.data.get('emails')
+    if not isinstance(emails, list) or not emails:
+        return Response(
+            EMAILS_LIST_REQUIRED_ERROR, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if len(emails) > MAX_BULK_VERIFY_EMAILS:
+        return Response(
+            TOO_MANY_EMAILS_ERROR, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    # Parse every email first so the lookup below covers all domains
+    parsed = []
+    for email in emails:
+        email = str(email).lower().strip()
+        domain = email.rpartition('@')[2] if EMAIL_RE.match(email) else None
+        parsed.append((email, domain))
+    
+    universities = lookup_verified_universities({domain for _, domain in parsed if domain})
+    
+    results = []
+    for email, domain in parsed:
+        if domain is None:
+            results.append({'email': email, 'verified': False, 'university': None, 'error': 'Invalid email format'})
+            continue
+        university = universities.get(domain)
+        results.append({
+            'email': email,
+            'verified': university is not None,
+            'university': university,
+            'domain': domain
+        })
+    
+    return Response({'results': results})
+
+
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def search_universities_by_domain(request):
@@ -225,7 +329,7 @@ def search_universities_by_domain(request):
     
     if not query or len(query) < 3:
         return Response(
-            {'error': 'Domain query must be at least 3 characters'}, 
+            DOMAIN_QUERY_TOO_SHORT_ERROR, 
             status=status.HTTP_400_BAD_REQUEST
         )
     